@@ -0,0 +1 @@
+# Benchmarks for the backend; run modules with `python -m backend.benchmarks.<name>`
@@ -0,0 +1,84 @@
+"""
+Compare throughput of the sync and async database paths under concurrency.
+
+Each operation loads the fund list and one fund by ID through its own session,
+which is what a request to the fund routes does.
+
+Usage:
+    python -m backend.benchmarks.bench_async_db --concurrency 50 --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Default to a throwaway SQLite database so the benchmark runs offline
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_async_db.db')}")
+
+from .. import database  # noqa: E402
+from .results import write_results  # noqa: E402
+
+def sync_operation(fund_id):
+    """Run one request's worth of reads on the sync path"""
+    db = database.SessionLocal()
+    try:
+        database.get_all_funds(db)
+        database.get_fund_row_by_id(fund_id, db)
+    finally:
+        db.close()
+
+async def async_operation(fund_id):
+    """Run one request's worth of reads on the async path"""
+    async with database.AsyncSessionLocal() as db:
+        await database.get_all_funds_async(db)
+        await database.get_fund_row_by_id_async(fund_id, db)
+
+def run_sync(n_requests, concurrency):
+    """Drive the sync path from a thread pool, as FastAPI does for `def` routes"""
+    fund_ids = [database.kenyan_funds[i % len(database.kenyan_funds)]["id"] for i in range(n_requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(sync_operation, fund_ids))
+    return time.perf_counter() - start
+
+async def run_async(n_requests, concurrency):
+    """Drive the async path from the event loop, bounded to the same concurrency"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(fund_id):
+        async with semaphore:
+            await async_operation(fund_id)
+
+    fund_ids = [database.kenyan_funds[i % len(database.kenyan_funds)]["id"] for i in range(n_requests)]
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded(fund_id) for fund_id in fund_ids))
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--output", help="Results file; defaults to backend/benchmarks/results/")
+    args = parser.parse_args()
+
+    if not (database.SessionLocal and database.AsyncSessionLocal):
+        raise SystemExit("Both sync and async database engines are required for this benchmark")
+
+    sync_elapsed = run_sync(args.requests, args.concurrency)
+    async_elapsed = asyncio.run(run_async(args.requests, args.concurrency))
+
+    print(f"database: {database.DATABASE_URL}")
+    print(f"requests: {args.requests}, concurrency: {args.concurrency}")
+    print(f"sync:  {sync_elapsed:.2f}s  {args.requests / sync_elapsed:.0f} req/s")
+    print(f"async: {async_elapsed:.2f}s  {args.requests / async_elapsed:.0f} req/s")
+
+    results = {
+        path: {"seconds": round(elapsed, 4), "throughput_per_s": round(args.requests / elapsed, 2)}
+        for path, elapsed in (("sync", sync_elapsed), ("async", async_elapsed))
+    }
+    write_results("bench_async_db", results, {**vars(args), "database_url": database.DATABASE_URL}, args.output)
+
+if __name__ == "__main__":
+    main()
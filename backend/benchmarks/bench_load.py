@@ -0,0 +1,168 @@
+"""
+Load test every API route against a local server and stub market data.
+
+Starts the stub Alpha Vantage server and the app under uvicorn in-process,
+against a throwaway SQLite database unless DATABASE_URL is set (use a local
+Postgres URL to load test Postgres). Each route is then driven by a pool of
+client threads, and per-route p50/p95/p99 latency and throughput are written
+to a JSON results file. Pass --base-url to target an already running server
+instead; it must be pointed at its own stub via ALPHA_VANTAGE_URL.
+
+Usage:
+    python -m backend.benchmarks.bench_load --requests 200 --concurrency 10
+    python -m backend.benchmarks.bench_load --routes funds,fund_detail --requests 5000
+"""
+import argparse
+import itertools
+import os
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .market_stub import MarketDataStub
+from .results import summarize, print_summary, write_results
+
+PROFILE = {"age": "35", "monthlyIncome": "120000", "investmentGoal": "wealth", "timeHorizon": "long",
+           "riskTolerance": 7, "existingInvestments": "some", "monthlyContribution": "15000"}
+
+def _forecast_job(session, base_url, fund_id):
+    """Submit a forecast job and wait for it, as a client of job mode does"""
+    response = session.post(f"{base_url}/api/forecast", json={"fundId": fund_id, "periods": 6, "mode": "job"})
+    if response.status_code != 202:
+        return response
+    return session.get(base_url + response.headers["Location"], params={"wait": 30})
+
+def _stream(session, base_url, fund_id):
+    """Read a whole recommendation stream"""
+    response = session.post(f"{base_url}/api/recommendations/stream", json=PROFILE, stream=True)
+    for _ in response.iter_lines():
+        pass
+    return response
+
+def _user(counter):
+    return {"name": "Load Test", "email": f"load{next(counter)}@example.com", "password": "secret"}
+
+def scenarios():
+    """Route name -> callable(session, base_url, fund_id) issuing one request"""
+    users = itertools.count()
+    return {
+        "root": lambda s, url, fund_id: s.get(f"{url}/"),
+        "register": lambda s, url, fund_id: s.post(f"{url}/api/register", json=_user(users)),
+        "login": lambda s, url, fund_id: s.post(
+            f"{url}/api/login", json={"email": "bench@example.com", "password": "secret"}),
+        "recommendations": lambda s, url, fund_id: s.post(f"{url}/api/recommendations", json=PROFILE),
+        "recommendations_stream": _stream,
+        "risk_profile": lambda s, url, fund_id: s.post(f"{url}/api/risk-profile", json=PROFILE),
+        "what_if": lambda s, url, fund_id: s.post(f"{url}/api/what-if", json={
+            "profileData": PROFILE, "ages": {"start": 20, "stop": 65, "step": 5},
+            "monthlyIncomes": [40000, 120000, 400000], "timeHorizons": ["short", "medium", "long"]}),
+        "projection": lambda s, url, fund_id: s.post(f"{url}/api/projection", json={
+            "profileData": PROFILE, "fundIds": [fund_id], "goalAmount": 5000000, "paths": 10000}),
+        "portfolio": lambda s, url, fund_id: s.post(f"{url}/api/portfolio", json={"profileData": PROFILE, "amount": 500000}),
+        "funds": lambda s, url, fund_id: s.get(f"{url}/api/funds"),
+        "funds_page": lambda s, url, fund_id: s.get(f"{url}/api/funds", params={"fields": "id,name,risk", "limit": 5}),
+        "fund_search": lambda s, url, fund_id: s.get(
+            f"{url}/api/funds/search", params={"risk": ["Low", "Medium"], "maxFee": 2.5, "sort": "-performancePercent"}),
+        "fund_detail": lambda s, url, fund_id: s.get(f"{url}/api/funds/{fund_id}"),
+        "fund_history": lambda s, url, fund_id: s.get(f"{url}/api/funds/{fund_id}/history"),
+        "forecast": lambda s, url, fund_id: s.post(f"{url}/api/forecast", json={"fundId": fund_id, "periods": 6}),
+        "forecast_job": _forecast_job,
+        "fund_metrics": lambda s, url, fund_id: s.get(f"{url}/api/funds/{fund_id}/metrics"),
+    }
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(port):
+    """Run the app under uvicorn on a background thread"""
+    import uvicorn
+    from ..main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="uvicorn", daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+def run_route(base_url, call, fund_ids, n_requests, concurrency):
+    """Issue n_requests through call from concurrency threads, returning latencies, errors and wall time"""
+    local = threading.local()
+    samples = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal errors
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            ok = call(local.session, base_url, fund_ids[i % len(fund_ids)]).status_code < 400
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            samples.append(elapsed)
+            errors += not ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(n_requests)))
+    return samples, errors, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--routes", help="Comma-separated subset of routes to run")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="Seconds the stub market data server adds")
+    parser.add_argument("--base-url", help="Target an already running server instead of starting one")
+    parser.add_argument("--output", help="Results file; defaults to backend/benchmarks/results/")
+    args = parser.parse_args()
+
+    routes = scenarios()
+    selected = args.routes.split(",") if args.routes else list(routes)
+    unknown = set(selected) - set(routes)
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(sorted(unknown))}; choose from {', '.join(routes)}")
+
+    stub = server = None
+    base_url = args.base_url
+    if base_url is None:
+        stub = MarketDataStub(latency=args.stub_latency).start()
+        # Must be set before the app is imported: utils and database read them at import time
+        os.environ["ALPHA_VANTAGE_URL"] = stub.url
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_load.db')}")
+        os.environ.setdefault("FORECAST_JOB_STORE", os.path.join(tempfile.gettempdir(), "bench_load_jobs.sqlite3"))
+        port = _free_port()
+        server, _ = start_server(port)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        fund_ids = [fund["id"] for fund in requests.get(f"{base_url}/api/funds").json()]
+        requests.post(f"{base_url}/api/register", json={"name": "Bench", "email": "bench@example.com", "password": "secret"})
+
+        results = {}
+        for name in selected:
+            samples, errors, elapsed = run_route(base_url, routes[name], fund_ids, args.requests, args.concurrency)
+            results[name] = summarize(samples, elapsed, errors)
+            print_summary(name, results[name])
+    finally:
+        if server is not None:
+            server.should_exit = True
+        if stub is not None:
+            print(f"Stub market data requests: {stub.requests}")
+            stub.stop()
+
+    config = {**vars(args), "database_url": os.getenv("DATABASE_URL") if args.base_url is None else None}
+    write_results("bench_load", results, config, args.output)
+
+if __name__ == "__main__":
+    main()
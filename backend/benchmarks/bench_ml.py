@@ -0,0 +1,113 @@
+"""
+Microbenchmarks for the ML layer.
+
+Times RiskProfiler.predict_risk_profile, FundMatcher.match_funds, their
+batch counterparts over every benchmark profile at once,
+FundForecaster.predict_future_performance (cold, including the Prophet fit,
+and warm) and get_performance_metrics on a nine-fund catalogue with
+history from the stub market data series.
+
+Usage:
+    python -m backend.benchmarks.bench_ml --iterations 500 --forecasts 20
+"""
+import argparse
+import copy
+import itertools
+import time
+
+from ..ml_models import RiskProfiler, FundMatcher, FundForecaster
+from .market_stub import monthly_series
+from .results import summarize, print_summary, write_results
+
+# Kept local so the benchmark does not connect to a database on import
+FUNDS = [
+    {"id": f"fund{i}", "name": f"Fund {i}", "company": "Benchmark Asset Managers",
+     "performancePercent": 8.0 + i, "risk": risk, "description": "Benchmark fund.",
+     "fee": 1.0 + i * 0.2, "minimumInvestment": 1000.0 * (i + 1), "assetClass": "Equity"}
+    for i, risk in enumerate(["Low", "Low-Medium", "Medium", "Medium-High", "High", "Very High", "High", "Low", "Medium"])
+]
+
+# A spread of profiles so the profiler and matcher see every category
+PROFILES = [
+    {"age": age, "monthlyIncome": income, "investmentGoal": goal, "timeHorizon": horizon,
+     "riskTolerance": tolerance, "existingInvestments": "some", "monthlyContribution": contribution}
+    for age, income, goal, horizon, tolerance, contribution in itertools.product(
+        ["22", "35", "58"], ["40000", "120000", "400000"], ["retirement", "wealth"],
+        ["short", "long"], [2, 6, 9], ["5000", "30000"]
+    )
+]
+
+def history(symbol, months=12):
+    """Monthly percentage change history, as utils.fetch_real_historical_data returns it"""
+    series = monthly_series(symbol)["Monthly Time Series"]
+    dates = sorted(series)[-months:]
+    base = float(series[dates[0]]["4. close"])
+    return [
+        {"date": day[:7], "value": round((float(series[day]["4. close"]) - base) / base * 100, 2)}
+        for day in dates
+    ]
+
+def measure(func, args_list):
+    """Call func once per args tuple, returning per-call latencies and the wall time"""
+    samples = []
+    start = time.perf_counter()
+    for args in args_list:
+        call_start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - call_start)
+    return samples, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--forecasts", type=int, default=20, help="Cold forecasts to time; each fits Prophet")
+    parser.add_argument("--output", help="Results file; defaults to backend/benchmarks/results/")
+    args = parser.parse_args()
+
+    profiler = RiskProfiler()
+    matcher = FundMatcher(FUNDS)
+    forecaster = FundForecaster()
+    profiles = [PROFILES[i % len(PROFILES)] for i in range(args.iterations)]
+    categories = [profiler.predict_risk_profile(profile) for profile in PROFILES]
+    histories = [history(fund["id"]) for fund in FUNDS]
+
+    benchmarks = {
+        "predict_risk_profile": (profiler.predict_risk_profile, [(profile,) for profile in profiles]),
+        "match_funds": (
+            matcher.match_funds,
+            [(copy.copy(profile), categories[i % len(PROFILES)]) for i, profile in enumerate(profiles)]
+        ),
+        # One call per batch of every profile, as a what-if grid makes
+        "predict_risk_profiles_batch": (
+            profiler.predict_risk_profiles, [(PROFILES,)] * max(1, args.iterations // 20)
+        ),
+        "match_fund_indices_batch": (
+            matcher.match_fund_indices, [(PROFILES, categories)] * max(1, args.iterations // 20)
+        ),
+        # Unique fund IDs so every call trains a fresh model
+        "predict_future_performance_cold": (
+            forecaster.predict_future_performance,
+            [(f"cold{i}", histories[i % len(histories)]) for i in range(args.forecasts)]
+        ),
+    }
+
+    results = {}
+    for label, (func, args_list) in benchmarks.items():
+        samples, elapsed = measure(func, args_list)
+        results[label] = summarize(samples, elapsed)
+        print_summary(label, results[label])
+
+    # Warm calls reuse the models fitted above
+    warm_args = [(f"cold{i % args.forecasts}", histories[i % len(histories)]) for i in range(args.iterations)]
+    for label, func, args_list in [
+        ("predict_future_performance_warm", forecaster.predict_future_performance, warm_args[:max(args.forecasts, 50)]),
+        ("get_performance_metrics", forecaster.get_performance_metrics, warm_args),
+    ]:
+        samples, elapsed = measure(func, args_list)
+        results[label] = summarize(samples, elapsed)
+        print_summary(label, results[label])
+
+    write_results("bench_ml", results, vars(args), args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark fund screening on a large synthetic catalogue.
+
+Builds a FundIndex over a generated fund universe and times a mix of
+screening queries against it. For comparison it also times the same queries
+as a plain Python filter and sort over the fund dicts, which is what the
+search would cost without the indexes. Results are checked to match.
+
+Usage:
+    python -m backend.benchmarks.bench_search --funds 100000 --iterations 200
+"""
+import argparse
+import time
+
+from ..fund_index import FundIndex
+from .fund_universe import generate_funds, timed
+from .results import summarize, print_summary, write_results
+
+# Screens a client would send: (filters, ranges, sort, descending)
+QUERIES = {
+    "all_default_order": ({}, {}, None, False),
+    "risk_sorted_by_fee": ({"risk": ["Low", "Low-Medium"]}, {}, "fee", False),
+    "equity_top_performers": ({"assetClass": ["Equity"]}, {"performancePercent": (5, None)}, "performancePercent", True),
+    "cheap_and_accessible": ({}, {"fee": (None, 1.5), "minimumInvestment": (None, 5000)}, "name", False),
+    "company_and_risk": ({"company": ["CIC Asset Management"], "risk": ["High", "Very High"]}, {}, "fee", False),
+    "narrow_fee_band": ({"assetClass": ["Money Market", "Fixed Income"]}, {"fee": (1.50, 1.52)}, None, False),
+}
+
+def naive_search(funds, filters, ranges, sort, descending, offset, limit):
+    """Filter and sort the fund dicts directly"""
+    matches = [
+        fund for fund in funds
+        if all(fund[field] in values for field, values in filters.items())
+        and all((low is None or fund[field] >= low) and (high is None or fund[field] <= high)
+                for field, (low, high) in ranges.items())
+    ]
+    if sort == "name":
+        matches.sort(key=lambda fund: ((fund["name"] or "").lower(), fund["id"]), reverse=descending)
+    elif sort:
+        matches.sort(key=lambda fund: (fund[sort], fund["id"]), reverse=descending)
+    else:
+        matches.sort(key=lambda fund: fund["id"], reverse=descending)
+    return matches[offset:offset + limit], len(matches)
+
+def run(search, iterations, *query):
+    """Time iterations calls of search, returning the latency samples and the last result"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = search(*query)
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--funds", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--skip-naive", action="store_true", help="Only time the indexed search")
+    parser.add_argument("--output", help="Results file; defaults to backend/benchmarks/results/")
+    args = parser.parse_args()
+
+    universe, _ = timed(f"generate {args.funds} funds", generate_funds, args.funds, args.months)
+    index, build_seconds = timed("build FundIndex", FundIndex, universe.funds)
+
+    results = {"index_build": {"seconds": round(build_seconds, 4)}}
+    for name, (filters, ranges, sort, descending) in QUERIES.items():
+        query = (filters, ranges, sort, descending, 0, args.limit)
+        samples, (page, total) = run(index.search, args.iterations, *query)
+        results[f"index:{name}"] = {**summarize(samples), "total": total}
+        print_summary(f"index:{name} ({total})", results[f"index:{name}"])
+
+        if not args.skip_naive:
+            # The naive scan is orders of magnitude slower, so a few runs are enough
+            samples, (expected, expected_total) = run(
+                naive_search, max(1, args.iterations // 20), index.funds, *query
+            )
+            results[f"naive:{name}"] = summarize(samples)
+            print_summary(f"naive:{name}", results[f"naive:{name}"])
+            if expected_total != total or [f["id"] for f in expected] != [f["id"] for f in page]:
+                raise SystemExit(f"{name}: indexed search disagrees with the naive scan")
+
+    write_results("bench_search", results, vars(args), args.output)
+
+if __name__ == "__main__":
+    main()
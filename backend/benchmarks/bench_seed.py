@@ -0,0 +1,82 @@
+"""
+Benchmark bulk seeding and re-syncing of the funds table.
+
+Seeds a fresh database with synthetic funds through sync_funds, then
+re-syncs with no changes and with a fraction of funds modified. Pass
+--legacy to also time the old one-object-per-fund `db.add` loop.
+
+Usage:
+    python -m backend.benchmarks.bench_seed --funds 100000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+# Default to a fresh throwaway SQLite database so the benchmark runs offline
+BENCH_DB_PATH = os.path.join(tempfile.gettempdir(), "bench_seed.db")
+if "DATABASE_URL" not in os.environ:
+    if os.path.exists(BENCH_DB_PATH):
+        os.remove(BENCH_DB_PATH)
+    os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DB_PATH}"
+
+from .. import database  # noqa: E402
+from .fund_universe import generate_funds  # noqa: E402
+from .results import write_results  # noqa: E402
+
+def synthetic_funds(n, seed=42):
+    """Generate n fund dicts shaped like kenyan_funds"""
+    return generate_funds(n, months=1, seed=seed).funds
+
+def timed(label, func, *args):
+    """Run func, print its wall time and return it with the rows written"""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.2f}s  rows written: {result}")
+    return {"seconds": round(elapsed, 4), "rows_written": result}
+
+def legacy_seed(db, funds):
+    """The previous seeding path: one ORM object and db.add per fund"""
+    for fund in funds:
+        db.add(database.FundModel(historical_data=[], **database._fund_row(fund)))
+    db.commit()
+    return len(funds)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--funds", type=int, default=100000)
+    parser.add_argument("--changed", type=float, default=0.1, help="Fraction of funds modified before the last sync")
+    parser.add_argument("--legacy", action="store_true", help="Also time the per-object db.add loop")
+    parser.add_argument("--output", help="Results file; defaults to backend/benchmarks/results/")
+    args = parser.parse_args()
+
+    if not database.SessionLocal:
+        raise SystemExit("A database connection is required for this benchmark")
+
+    funds = synthetic_funds(args.funds)
+    print(f"database: {database.DATABASE_URL}")
+    print(f"funds: {args.funds}")
+
+    results = {}
+    db = database.SessionLocal()
+    try:
+        results["bulk_seed"] = timed("bulk seed", database.sync_funds, db, funds)
+        results["resync_unchanged"] = timed("re-sync, unchanged", database.sync_funds, db, funds)
+
+        rng = random.Random(7)
+        for fund in rng.sample(funds, int(len(funds) * args.changed)):
+            fund["fee"] = round(fund["fee"] + 0.1, 2)
+        results["resync_changed"] = timed(f"re-sync, {args.changed:.0%} changed", database.sync_funds, db, funds)
+
+        if args.legacy:
+            legacy_funds = [dict(fund, id=f"legacy-{fund['id']}") for fund in funds]
+            results["legacy_seed"] = timed("legacy db.add loop", legacy_seed, db, legacy_funds)
+    finally:
+        db.close()
+
+    write_results("bench_seed", results, {**vars(args), "database_url": database.DATABASE_URL}, args.output)
+
+if __name__ == "__main__":
+    main()
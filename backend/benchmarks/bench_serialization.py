@@ -0,0 +1,100 @@
+"""
+Benchmark response serialization for recommendation payloads.
+
+Builds payloads the way get_fund_recommendations does, with funds from
+FundMatcher.match_funds (NumPy scalars included), twelve months of
+history, a six month forecast and metrics. Then compares FastAPI's default
+jsonable_encoder + JSONResponse path with FastJSONResponse, and reports
+gzip and brotli compression cost and size.
+
+Usage:
+    python -m backend.benchmarks.bench_serialization --iterations 2000
+"""
+import argparse
+import copy
+import time
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from ..ml_models import FundMatcher
+from ..responses import FastJSONResponse, brotli, compress
+from .results import write_results
+
+# Kept local so the benchmark does not connect to a database on import
+FUNDS = [
+    {"id": f"fund{i}", "name": f"Fund {i}", "company": "Benchmark Asset Managers",
+     "performancePercent": 8.0 + i, "risk": risk, "description": "Benchmark fund. " * 8,
+     "fee": 1.0 + i * 0.2, "minimumInvestment": 1000.0 * (i + 1), "assetClass": "Equity"}
+    for i, risk in enumerate(["Low", "Low-Medium", "Medium", "Medium-High", "High", "Very High", "High", "Low", "Medium"])
+]
+
+PROFILE = {"age": "35", "monthlyIncome": "120000", "investmentGoal": "wealth", "timeHorizon": "long",
+           "riskTolerance": 7, "existingInvestments": "some", "monthlyContribution": "15000"}
+
+def recommendation_payload(rng):
+    """Build one recommendation response as produced by the ML layer"""
+    matcher = FundMatcher(FUNDS)
+    funds = matcher.match_funds(PROFILE, "Growth")
+    for fund in funds:
+        values = np.cumsum(rng.normal(0.8, 2.0, 12))
+        fund["historicalData"] = [
+            {"date": f"2024-{month + 1:02d}", "value": round(values[month], 2), "benchmark": round(values[month] * 0.9, 2)}
+            for month in range(12)
+        ]
+        fund["forecast"] = [
+            {"date": f"2025-{month + 1:02d}", "predicted_value": round(values[-1] + month, 2),
+             "lower_bound": round(values[-1] + month - 3, 2), "upper_bound": round(values[-1] + month + 3, 2)}
+            for month in range(6)
+        ]
+        fund["metrics"] = {"average_return": round(values.mean(), 2), "volatility": round(np.std(values), 2),
+                           "sharpe_ratio": round(values.mean() / np.std(values), 2)}
+    return funds
+
+def bench(label, func, payloads):
+    """Time func over every payload and print the per-payload cost, returning the last result and the cost in us"""
+    start = time.perf_counter()
+    for payload in payloads:
+        result = func(payload)
+    per_payload = (time.perf_counter() - start) / len(payloads) * 1e6
+    print(f"{label:<32} {per_payload:9.1f} us/payload")
+    return result, per_payload
+
+def default_render(payload):
+    """FastAPI's path for a returned dict: jsonable_encoder, then json.dumps"""
+    return JSONResponse(jsonable_encoder(payload)).body
+
+def fast_render(payload):
+    return FastJSONResponse(payload).body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="Results file; defaults to backend/benchmarks/results/")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    template = recommendation_payload(rng)
+    payloads = [copy.deepcopy(template) for _ in range(args.iterations)]
+
+    default_body, default_us = bench("jsonable_encoder + JSONResponse", default_render, payloads)
+    fast_body, fast_us = bench("FastJSONResponse (orjson)", fast_render, payloads)
+    print(f"body size: default {len(default_body)} bytes, orjson {len(fast_body)} bytes")
+    results = {
+        "default_render": {"us_per_payload": round(default_us, 2), "bytes": len(default_body)},
+        "fast_render": {"us_per_payload": round(fast_us, 2), "bytes": len(fast_body)},
+    }
+
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    for encoding in encodings:
+        compressed, compress_us = bench(
+            f"{encoding} compress", lambda body: compress(body, encoding), [fast_body] * args.iterations
+        )
+        print(f"{encoding} size: {len(compressed)} bytes ({len(compressed) / len(fast_body):.0%})")
+        results[f"compress:{encoding}"] = {"us_per_payload": round(compress_us, 2), "bytes": len(compressed)}
+
+    write_results("bench_serialization", results, vars(args), args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Generate a synthetic fund universe and load it for scaling tests.
+
+Funds get risk levels, fees and minimum investments drawn from
+distributions that follow their asset class. Monthly histories come from a
+factor model: a shared market return, an asset class return and an
+idiosyncratic term, with market beta and volatility rising with risk. The
+funds are correlated through the shared factors. Histories are percentage
+changes from the first month, as utils.fetch_real_historical_data returns
+them, and carry the market factor as their benchmark.
+
+The universe is loaded into the funds and fund_returns tables and the fund
+matcher. Without a database it is appended to the in-memory fallback
+catalogue instead. The load and the main read paths are then timed.
+
+Usage:
+    python -m backend.benchmarks.fund_universe --funds 100000
+    python -m backend.benchmarks.fund_universe --funds 1000000 --months 24 --no-history
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import namedtuple
+from datetime import date
+
+import numpy as np
+
+from .results import write_results
+
+RISK_LEVELS = ["Low", "Low-Medium", "Medium", "Medium-High", "High", "Very High"]
+
+# Asset class -> (share of funds, risk level weights, median fee %)
+ASSET_CLASSES = {
+    "Money Market": (0.20, [0.85, 0.15, 0, 0, 0, 0], 1.5),
+    "Fixed Income": (0.20, [0.25, 0.55, 0.20, 0, 0, 0], 1.8),
+    "Mixed Allocation": (0.25, [0, 0.15, 0.45, 0.35, 0.05, 0], 2.2),
+    "Equity": (0.30, [0, 0, 0.05, 0.25, 0.50, 0.20], 2.6),
+    "Alternative": (0.05, [0, 0, 0.10, 0.20, 0.40, 0.30], 3.0),
+}
+
+# Per risk level: (market beta, idiosyncratic monthly volatility %)
+RISK_FACTORS = np.array([(0.05, 0.2), (0.2, 0.6), (0.5, 1.2), (0.75, 1.8), (1.0, 2.5), (1.3, 3.5)])
+
+MINIMUM_INVESTMENTS = np.array([1000, 2500, 5000, 7500, 10000, 15000, 20000, 50000, 100000])
+MINIMUM_INVESTMENT_WEIGHTS = np.array([0.18, 0.10, 0.24, 0.08, 0.18, 0.08, 0.07, 0.05, 0.02])
+
+COMPANIES = [
+    "CIC", "Britam", "Old Mutual", "Sanlam", "ICEA Lion", "NCBA", "Cytonn", "Zimele", "Genghis", "Madison",
+    "Dry Associates", "Nabo", "GenAfrica", "Apollo", "KCB", "Co-op Trust", "Absa", "Standard", "Equity", "Jubilee",
+]
+
+# Funds and their history arrays; values and benchmark are (n_funds, months) and (months,)
+FundUniverse = namedtuple("FundUniverse", ["funds", "dates", "values", "benchmark"])
+
+def month_labels(months, end=None):
+    """The last `months` month labels (YYYY-MM), oldest first"""
+    end = end or date.today()
+    labels = []
+    for i in range(months - 1, -1, -1):
+        year, month = divmod(end.year * 12 + end.month - 1 - i, 12)
+        labels.append(f"{year}-{month + 1:02d}")
+    return labels
+
+def generate_funds(n, months=12, seed=42):
+    """Generate n funds shaped like kenyan_funds, with correlated monthly histories"""
+    rng = np.random.default_rng(seed)
+    class_names = list(ASSET_CLASSES)
+    shares = np.array([ASSET_CLASSES[name][0] for name in class_names])
+    class_idx = rng.choice(len(class_names), size=n, p=shares)
+
+    # Risk levels conditional on asset class
+    risk_idx = np.empty(n, dtype=np.int64)
+    for c, name in enumerate(class_names):
+        members = np.flatnonzero(class_idx == c)
+        risk_idx[members] = rng.choice(len(RISK_LEVELS), size=members.size, p=ASSET_CLASSES[name][1])
+
+    # Fees are log-normal around the asset class median
+    median_fee = np.array([ASSET_CLASSES[name][2] for name in class_names])[class_idx]
+    fees = np.clip(np.round(median_fee * rng.lognormal(0, 0.2, n), 2), 0.25, 5.0)
+    minimums = rng.choice(MINIMUM_INVESTMENTS, size=n, p=MINIMUM_INVESTMENT_WEIGHTS)
+
+    # Monthly returns (%) = beta * market + asset class factor + idiosyncratic noise
+    market = rng.normal(0.8, 4.0, months)
+    class_factor = rng.normal(0.0, 1.5, (len(class_names), months))
+    beta = RISK_FACTORS[risk_idx, 0] * rng.uniform(0.8, 1.2, n)
+    volatility = RISK_FACTORS[risk_idx, 1]
+    carry = np.where(np.array(class_names)[class_idx] == "Money Market", 0.75, 0.1)
+    returns = (
+        carry[:, None]
+        + beta[:, None] * market[None, :]
+        + class_factor[class_idx]
+        + volatility[:, None] * rng.standard_normal((n, months))
+    )
+    # Cumulative change from the first month, so the first point is 0 like the live data
+    growth = np.cumprod(1 + returns / 100, axis=1)
+    values = np.round((growth / growth[:, :1] - 1) * 100, 2)
+    market_growth = np.cumprod(1 + market / 100)
+    benchmark = np.round((market_growth / market_growth[0] - 1) * 100, 2)
+
+    companies = rng.integers(0, len(COMPANIES), n)
+    funds = [
+        {
+            "id": f"synthetic-{i:07d}",
+            "name": f"{COMPANIES[companies[i]]} {class_names[class_idx[i]]} Fund {i}",
+            "company": f"{COMPANIES[companies[i]]} Asset Management",
+            "performancePercent": float(values[i, -1]),
+            "risk": RISK_LEVELS[risk_idx[i]],
+            "description": f"Synthetic {class_names[class_idx[i]].lower()} fund used for scaling tests.",
+            "fee": float(fees[i]),
+            "minimumInvestment": int(minimums[i]),
+            "assetClass": class_names[class_idx[i]],
+        }
+        for i in range(n)
+    ]
+    return FundUniverse(funds, month_labels(months), values, benchmark)
+
+def history_points(universe, i):
+    """History points for the i-th fund, as the API returns them"""
+    return [
+        {"date": label, "value": float(value), "benchmark": float(bench)}
+        for label, value, bench in zip(universe.dates, universe.values[i], universe.benchmark)
+    ]
+
+def monthly_returns(values):
+    """Month-on-month percentage returns of cumulative histories along the last axis"""
+    growth = 1 + np.asarray(values, dtype=float) / 100
+    return (growth[..., 1:] / growth[..., :-1] - 1) * 100
+
+def history_rows(universe, start, stop):
+    """fund_returns rows for funds start..stop, for multi-fund batch inserts"""
+    stop = min(stop, len(universe.funds))
+    returns = monthly_returns(universe.values[start:stop]).tolist()
+    # The first month has no return of its own; the benchmark's is its base
+    benchmark = [0.0] + monthly_returns(universe.benchmark).tolist()
+    rows = []
+    for i in range(start, stop):
+        fund_id = universe.funds[i]["id"]
+        for label, monthly_return, bench in zip(universe.dates, [None] + returns[i - start], benchmark):
+            rows.append({"fund_id": fund_id, "date": label, "monthly_return": monthly_return, "benchmark_return": bench})
+    return rows
+
+def load_into_db(db, universe, with_history=True, batch_size=10000):
+    """Sync the funds and, optionally, their histories into the database in batches"""
+    from .. import database
+
+    funds = universe.funds
+    for start in range(0, len(funds), batch_size):
+        database.sync_funds(db, funds[start:start + batch_size])
+    if with_history:
+        # Keep each executemany around batch_size rows regardless of history length
+        funds_per_batch = max(1, batch_size // max(1, len(universe.dates)))
+        for start in range(0, len(funds), funds_per_batch):
+            database.upsert_history_rows(db, history_rows(universe, start, start + funds_per_batch))
+
+def load_in_memory(universe, with_history=True):
+    """Append the funds to the fallback catalogue used when no database is configured"""
+    from .. import database
+
+    if with_history:
+        for i, fund in enumerate(universe.funds):
+            fund["historicalData"] = history_points(universe, i)
+    database.kenyan_funds.extend(universe.funds)
+    database.bump_fund_data_version(catalog=True)
+
+def load_universe(universe, with_history=True, batch_size=10000):
+    """Load a universe into the database when there is one, else memory, and rebuild the matcher"""
+    from .. import database
+
+    if database.SessionLocal and database.engine:
+        db = database.SessionLocal()
+        try:
+            load_into_db(db, universe, with_history, batch_size)
+            database.refresh_fund_matcher(database.get_all_funds_internal(db))
+        finally:
+            db.close()
+    else:
+        load_in_memory(universe, with_history)
+        database.refresh_fund_matcher(database.kenyan_funds)
+
+def timed(label, func, *args):
+    """Run func, print its wall time and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed:9.3f}s")
+    return result, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--funds", type=int, default=100000)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--no-history", action="store_true", help="Only load fund metadata")
+    parser.add_argument("--keep", action="store_true", help="Reuse an existing throwaway database")
+    parser.add_argument("--output", help="Results file; defaults to backend/benchmarks/results/")
+    args = parser.parse_args()
+
+    # Default to a fresh throwaway SQLite database so the run stays offline
+    db_path = os.path.join(tempfile.gettempdir(), "fund_universe.db")
+    if "DATABASE_URL" not in os.environ:
+        if os.path.exists(db_path) and not args.keep:
+            os.remove(db_path)
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from .. import database
+
+    timings = {}
+    universe, timings["generate"] = timed(f"generate {args.funds} funds", generate_funds, args.funds, args.months, args.seed)
+    _, timings["load"] = timed("load into db and matcher", load_universe, universe, not args.no_history, args.batch_size)
+
+    db = database.SessionLocal() if database.SessionLocal else None
+    try:
+        funds, timings["get_all_funds_internal"] = timed("get_all_funds_internal", database.get_all_funds_internal, db)
+        _, timings["fund_matcher_build"] = timed("FundMatcher build", database.refresh_fund_matcher, funds)
+        _, timings["funds_page"] = timed("get_funds_page (limit 50)", database.get_funds_page, db, None, None, 50)
+        profile = {"age": "35", "monthlyIncome": "120000", "investmentGoal": "wealth", "timeHorizon": "long",
+                   "riskTolerance": 7, "existingInvestments": "some", "monthlyContribution": "15000"}
+        _, timings["match_funds"] = timed("match_funds", database.match_recommended_funds, profile, db)
+    finally:
+        if db is not None:
+            db.close()
+
+    print(f"funds in catalogue: {len(funds)}")
+    results = {label: {"seconds": round(seconds, 4)} for label, seconds in timings.items()}
+    write_results("fund_universe", results, {**vars(args), "database_url": database.DATABASE_URL}, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Local stand-in for the Alpha Vantage TIME_SERIES_MONTHLY endpoint.
+
+Serves a deterministic random walk per symbol, so benchmarks and load tests
+run offline and see the same market data on every run. Point the backend at
+it with ALPHA_VANTAGE_URL.
+
+Usage:
+    python -m backend.benchmarks.market_stub --port 8900 --latency 0.05
+    ALPHA_VANTAGE_URL=http://127.0.0.1:8900/query uvicorn backend.main:app
+"""
+import argparse
+import json
+import threading
+import time
+import zlib
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+def monthly_series(symbol, months=60):
+    """Build a TIME_SERIES_MONTHLY payload for a symbol, seeded by its name"""
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+    closes = 100 * np.cumprod(1 + rng.normal(0.006, 0.04, months))
+    today = date.today()
+    series = {}
+    for i, close in enumerate(closes[::-1]):
+        year, month = divmod(today.year * 12 + today.month - 1 - i, 12)
+        series[f"{year}-{month + 1:02d}-28"] = {
+            "1. open": f"{close * 0.99:.4f}", "2. high": f"{close * 1.02:.4f}",
+            "3. low": f"{close * 0.97:.4f}", "4. close": f"{close:.4f}", "5. volume": "1000000",
+        }
+    return {"Meta Data": {"2. Symbol": symbol}, "Monthly Time Series": series}
+
+class MarketDataStub:
+    """Threaded HTTP server answering Alpha Vantage queries, usable as a context manager"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0):
+        stub = self
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._payloads = {}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._count()
+                query = parse_qs(urlparse(self.path).query)
+                symbol = query.get("symbol", [""])[0]
+                if query.get("function", [""])[0] != "TIME_SERIES_MONTHLY" or not symbol:
+                    body = {"Error Message": "Invalid API call."}
+                else:
+                    body = stub._payload(symbol)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                encoded = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/query"
+
+    def _count(self):
+        with self._lock:
+            self.requests += 1
+
+    def _payload(self, symbol):
+        with self._lock:
+            if symbol not in self._payloads:
+                self._payloads[symbol] = monthly_series(symbol)
+            return self._payloads[symbol]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="market-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    args = parser.parse_args()
+
+    stub = MarketDataStub(args.host, args.port, args.latency)
+    print(f"Serving stub market data at {stub.url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.server.server_close()
+
+if __name__ == "__main__":
+    main()
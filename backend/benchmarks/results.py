@@ -0,0 +1,101 @@
+"""
+Latency summaries and machine-readable result files shared by the benchmarks.
+
+Results are written as JSON tagged with the git commit, so two runs can be
+diffed with:
+    python -m backend.benchmarks.results old.json new.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+def summarize(samples, elapsed=None, errors=0):
+    """Summarize latency samples in seconds as milliseconds percentiles and throughput"""
+    ms = np.asarray(samples, dtype=float) * 1000
+    summary = {
+        "count": int(ms.size),
+        "errors": errors,
+        "mean_ms": round(float(ms.mean()), 3) if ms.size else None,
+        "p50_ms": round(float(np.percentile(ms, 50)), 3) if ms.size else None,
+        "p95_ms": round(float(np.percentile(ms, 95)), 3) if ms.size else None,
+        "p99_ms": round(float(np.percentile(ms, 99)), 3) if ms.size else None,
+        "max_ms": round(float(ms.max()), 3) if ms.size else None,
+    }
+    total = elapsed if elapsed is not None else ms.sum() / 1000
+    summary["throughput_per_s"] = round(ms.size / total, 2) if total else None
+    return summary
+
+def print_summary(label, summary):
+    """Print one summary as an aligned table row"""
+    if summary["count"] == 0:
+        print(f"{label:<40} no samples")
+        return
+    print(
+        f"{label:<40} p50 {summary['p50_ms']:9.3f} ms  p95 {summary['p95_ms']:9.3f} ms  "
+        f"p99 {summary['p99_ms']:9.3f} ms  {summary['throughput_per_s']:10.1f}/s"
+        + (f"  errors {summary['errors']}" if summary["errors"] else "")
+    )
+
+def git_commit():
+    """Get the current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(__file__), stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def write_results(benchmark, results, config, output=None):
+    """Write results with run metadata to JSON, returning the path"""
+    commit = git_commit()
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{benchmark}-{commit or 'nogit'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    document = {
+        "benchmark": benchmark,
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    print(f"Results written to {output}")
+    return output
+
+def compare(old, new, metric="p95_ms"):
+    """Print the change in a metric for every result present in both files"""
+    print(f"{old['benchmark']}: {old['commit']} -> {new['commit']} ({metric})")
+    for label, summary in new["results"].items():
+        before = old["results"].get(label, {}).get(metric)
+        after = summary.get(metric)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0
+        print(f"{label:<40} {before:10.3f} -> {after:10.3f}  {change:+7.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--metric", default="p95_ms")
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    compare(old, new, args.metric)
+
+if __name__ == "__main__":
+    main()
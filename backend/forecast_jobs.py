@@ -0,0 +1,255 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+class QueueFullError(Exception):
+    """Raised when the forecast job queue has no room for another job"""
+
+class ForecastJobStore:
+    """
+    Persists forecast jobs and their results in a local SQLite file.
+
+    Several worker processes on one host may share the file. Each job records
+    the process that runs it, and queued or running jobs are only marked
+    failed once that process has exited.
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._owner_pid = None
+        self._owner_id = None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS forecast_jobs ("
+                " id TEXT PRIMARY KEY, fund_id TEXT NOT NULL, periods INTEGER NOT NULL,"
+                " data_version TEXT, status TEXT NOT NULL, result TEXT, error TEXT,"
+                " created_at REAL NOT NULL, finished_at REAL, owner TEXT, owner_pid INTEGER)"
+            )
+            # Files created before jobs recorded their owner
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(forecast_jobs)")}
+            for column, column_type in (("owner", "TEXT"), ("owner_pid", "INTEGER")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE forecast_jobs ADD COLUMN {column} {column_type}")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_forecast_jobs_lookup"
+                " ON forecast_jobs (fund_id, periods, data_version, status)"
+            )
+        self.fail_orphaned()
+
+    @property
+    def owner(self):
+        """ID of the current process's jobs, regenerated after a fork"""
+        if self._owner_pid != os.getpid():
+            self._owner_pid = os.getpid()
+            self._owner_id = f"{self._owner_pid}:{uuid.uuid4().hex[:12]}"
+        return self._owner_id
+
+    def _owner_alive(self, owner, owner_pid):
+        """Check whether the process that owns a job can still finish it"""
+        if owner == self.owner:
+            return True
+        if owner_pid is None or owner_pid == os.getpid():
+            # Same PID under a different owner ID is an earlier run of this process
+            return False
+        try:
+            os.kill(owner_pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        except OSError:
+            return False
+        return True
+
+    def fail_orphaned(self):
+        """Mark queued and running jobs failed when the process running them has exited"""
+        with self._lock, self._conn:
+            owners = self._conn.execute(
+                "SELECT DISTINCT owner, owner_pid FROM forecast_jobs WHERE status IN ('queued', 'running')"
+            ).fetchall()
+            for row in owners:
+                if not self._owner_alive(row["owner"], row["owner_pid"]):
+                    self._conn.execute(
+                        "UPDATE forecast_jobs SET status = 'failed', error = 'Interrupted by restart', finished_at = ?"
+                        " WHERE status IN ('queued', 'running') AND owner IS ? AND owner_pid IS ?",
+                        (time.time(), row["owner"], row["owner_pid"])
+                    )
+
+    def create(self, job_id, fund_id, periods, data_version):
+        """Record a newly queued job"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO forecast_jobs (id, fund_id, periods, data_version, status, created_at, owner, owner_pid)"
+                " VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, fund_id, periods, data_version, time.time(), self.owner, os.getpid())
+            )
+
+    def update(self, job_id, status, result=None, error=None, data_version=None):
+        """Record a job's status and, once finished, its result or error and the data version it reflects"""
+        finished_at = time.time() if status in ("done", "failed") else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE forecast_jobs SET status = ?, result = ?, error = ?, finished_at = ?,"
+                " data_version = COALESCE(?, data_version) WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, finished_at, data_version, job_id)
+            )
+
+    def get(self, job_id):
+        """Get a job by ID"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM forecast_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row and row["status"] in ("queued", "running") and not self._owner_alive(row["owner"], row["owner_pid"]):
+            # Its worker process died since it was queued
+            self.fail_orphaned()
+            return self.get(job_id)
+        return self._to_dict(row) if row else None
+
+    def find_active(self, fund_id, periods, data_version):
+        """Get a queued or running job for the same forecast, from any live worker process"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM forecast_jobs WHERE fund_id = ? AND periods = ? AND data_version = ?"
+                " AND status IN ('queued', 'running') ORDER BY created_at DESC",
+                (fund_id, periods, data_version)
+            ).fetchall()
+        for row in rows:
+            if self._owner_alive(row["owner"], row["owner_pid"]):
+                return self._to_dict(row)
+        return None
+
+    def find_done(self, fund_id, periods, data_version):
+        """Get the latest finished job for a forecast computed from the same data"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM forecast_jobs WHERE fund_id = ? AND periods = ? AND data_version = ?"
+                " AND status = 'done' ORDER BY finished_at DESC LIMIT 1",
+                (fund_id, periods, data_version)
+            ).fetchone()
+        return self._to_dict(row) if row else None
+
+    @staticmethod
+    def _to_dict(row):
+        """Convert a job row into the API job dict"""
+        return {
+            "jobId": row["id"],
+            "fundId": row["fund_id"],
+            "periods": row["periods"],
+            "status": row["status"],
+            "forecast": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "createdAt": row["created_at"],
+            "finishedAt": row["finished_at"],
+        }
+
+class ForecastJobQueue:
+    """
+    Runs forecasts on a bounded worker pool.
+
+    Submissions for a fund and period count that is already queued or running
+    share the existing job instead of starting another fit, including jobs
+    running in another worker process that shares the store.
+    """
+
+    def __init__(self, run_forecast, store, max_workers=2, max_pending=100, poll_interval=0.25, data_version=None):
+        self.run_forecast = run_forecast
+        # Called once a forecast finishes, to tag it with the data it was computed from
+        self.data_version = data_version
+        self.store = store
+        self.max_pending = max_pending
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="forecast-job")
+        self._lock = threading.Lock()
+        self._active = {}  # (fund_id, periods) -> (job_id, future)
+        self._futures = {}  # job_id -> future
+        self.submitted = 0
+        self.deduplicated = 0
+        self.rejected = 0
+
+    def submit(self, fund_id, periods, data_version):
+        """Enqueue a forecast, returning the job ID and whether an existing job was reused"""
+        key = (fund_id, periods)
+        with self._lock:
+            if key in self._active:
+                self.deduplicated += 1
+                return self._active[key][0], True
+            shared = self.store.find_active(fund_id, periods, data_version)
+            if shared is not None:
+                self.deduplicated += 1
+                return shared["jobId"], True
+            if len(self._active) >= self.max_pending:
+                self.rejected += 1
+                raise QueueFullError("Forecast job queue is full")
+
+            job_id = uuid.uuid4().hex
+            self.store.create(job_id, fund_id, periods, data_version)
+            future = self._executor.submit(self._run, job_id, fund_id, periods)
+            self._active[key] = (job_id, future)
+            self._futures[job_id] = future
+            self.submitted += 1
+        future.add_done_callback(lambda _: self._finish(key, job_id))
+        return job_id, False
+
+    def _run(self, job_id, fund_id, periods):
+        """Run one forecast job on a worker thread"""
+        try:
+            self.store.update(job_id, "running")
+            forecast = self.run_forecast(fund_id, periods)
+            if forecast is None:
+                self.store.update(job_id, "failed", error="Fund not found")
+            else:
+                # Serializing and storing the result can fail too; the job must not stay running
+                version = self.data_version() if self.data_version else None
+                self.store.update(job_id, "done", result=forecast, data_version=version)
+        except Exception as e:
+            logger.error(f"Forecast job {job_id} for fund {fund_id} failed: {str(e)}")
+            self.store.update(job_id, "failed", error=str(e))
+
+    def _finish(self, key, job_id):
+        """Release a job's deduplication slot once it completes"""
+        with self._lock:
+            if self._active.get(key, (None,))[0] == job_id:
+                del self._active[key]
+            self._futures.pop(job_id, None)
+
+    def get(self, job_id):
+        """Get a job's status and result"""
+        return self.store.get(job_id)
+
+    async def wait(self, job_id, timeout):
+        """Wait up to timeout seconds for a job to finish, then return its state"""
+        future = self._futures.get(job_id)
+        if future is not None and timeout > 0:
+            try:
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+            except asyncio.TimeoutError:
+                pass
+            return self.get(job_id)
+
+        # Jobs run by another worker process can only be followed through the store
+        deadline = time.monotonic() + timeout
+        job = self.get(job_id)
+        while job is not None and job["status"] in ("queued", "running") and time.monotonic() < deadline:
+            await asyncio.sleep(min(self.poll_interval, max(deadline - time.monotonic(), 0)))
+            job = self.get(job_id)
+        return job
+
+    def stats(self):
+        """Get queue occupancy and submission counters"""
+        with self._lock:
+            return {
+                "active": len(self._active),
+                "max_pending": self.max_pending,
+                "submitted": self.submitted,
+                "deduplicated": self.deduplicated,
+                "rejected": self.rejected,
+            }
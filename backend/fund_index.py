@@ -0,0 +1,132 @@
+import numpy as np
+
+# Fields that can be filtered by exact value, each backed by one bitmap per value
+CATEGORICAL_FIELDS = ("risk", "assetClass", "company")
+
+# Fields that can be filtered by range and sorted on, each backed by a sorted array
+NUMERIC_FIELDS = ("fee", "minimumInvestment", "performancePercent")
+
+SORT_FIELDS = NUMERIC_FIELDS + ("name",)
+
+# Fund fields returned by a search; history and descriptions are left to the detail route
+RESULT_FIELDS = ("id", "name", "company", "performancePercent", "risk", "fee", "minimumInvestment", "assetClass")
+
+class FundIndex:
+    """
+    Immutable in-memory indexes over fund metadata for multi-attribute screening.
+
+    Categorical fields keep a boolean bitmap per distinct value and numeric
+    fields keep their positions sorted by value. A query ANDs the bitmaps,
+    takes the narrowest numeric range from its sorted array with a binary
+    search and checks the remaining conditions only on those candidates.
+    """
+
+    def __init__(self, funds):
+        self.funds = [{field: fund.get(field) for field in RESULT_FIELDS} for fund in funds]
+        self.size = len(self.funds)
+
+        self.bitmaps = {}
+        for field in CATEGORICAL_FIELDS:
+            values = np.array([fund[field] or "" for fund in self.funds], dtype=object)
+            self.bitmaps[field] = {value: values == value for value in set(values.tolist())}
+
+        # Break ties by ID so every ordering is deterministic
+        ids = np.array([fund["id"] for fund in self.funds], dtype=object)
+        id_rank = np.empty(self.size, dtype=np.int64)
+        id_rank[np.argsort(ids, kind="stable")] = np.arange(self.size)
+
+        self.values = {}
+        self.order = {}
+        self.sorted_values = {}
+        self.rank = {}
+        for field in SORT_FIELDS:
+            if field == "name":
+                keys = np.array([(fund["name"] or "").lower() for fund in self.funds], dtype=object)
+                _, keys = np.unique(keys, return_inverse=True)
+            else:
+                keys = np.array([fund[field] if fund[field] is not None else np.nan for fund in self.funds], dtype=float)
+                self.values[field] = keys
+            order = np.lexsort((id_rank, keys))
+            self.order[field] = order
+            self.rank[field] = np.empty(self.size, dtype=np.int64)
+            self.rank[field][order] = np.arange(self.size)
+            if field != "name":
+                self.sorted_values[field] = keys[order]
+        self.id_rank = id_rank
+        self.default_order = np.argsort(id_rank)
+
+    def _range(self, field, low, high):
+        """Positions of funds whose field lies in [low, high], from a binary search of the sorted array"""
+        sorted_values = self.sorted_values[field]
+        start = 0 if low is None else np.searchsorted(sorted_values, low, side="left")
+        stop = np.searchsorted(sorted_values, np.inf if high is None else high, side="right")
+        return self.order[field][start:stop]
+
+    def search(self, filters=None, ranges=None, sort=None, descending=False, offset=0, limit=50):
+        """
+        Find funds matching every filter, returning (page, total).
+
+        filters maps categorical fields to lists of accepted values, ranges
+        maps numeric fields to (low, high) bounds where either may be None.
+        """
+        filters = {field: values for field, values in (filters or {}).items() if values}
+        ranges = {field: bounds for field, bounds in (ranges or {}).items() if bounds != (None, None)}
+
+        mask = None
+        for field, values in filters.items():
+            field_mask = None
+            for value in values:
+                bitmap = self.bitmaps[field].get(value)
+                if bitmap is not None:
+                    field_mask = bitmap.copy() if field_mask is None else np.logical_or(field_mask, bitmap, out=field_mask)
+            if field_mask is None:
+                return [], 0
+            mask = field_mask if mask is None else np.logical_and(mask, field_mask, out=mask)
+
+        if ranges:
+            # Drive the query from the narrowest range and check everything else on its candidates
+            candidates = min((self._range(field, *bounds) for field, bounds in ranges.items()), key=len)
+            if mask is not None:
+                candidates = candidates[mask[candidates]]
+            for field, (low, high) in ranges.items():
+                values = self.values[field][candidates]
+                keep = np.ones(len(candidates), dtype=bool)
+                if low is not None:
+                    keep &= values >= low
+                if high is not None:
+                    keep &= values <= high
+                candidates = candidates[keep]
+        elif mask is not None:
+            candidates = np.flatnonzero(mask)
+        else:
+            candidates = None
+
+        total = self.size if candidates is None else len(candidates)
+        order = self.order[sort] if sort else self.default_order
+        if candidates is None:
+            ordered = order[::-1] if descending else order
+            page = ordered[offset:offset + limit]
+        elif len(candidates) * 16 > self.size:
+            # Large result sets: walk the precomputed order rather than sorting, stopping once the page is full
+            selected = np.zeros(self.size, dtype=bool)
+            selected[candidates] = True
+            ordered = order[::-1] if descending else order
+            wanted = offset + limit
+            block = max(1024, wanted * self.size // len(candidates) * 2)
+            found = []
+            count = 0
+            for start in range(0, self.size, block):
+                chunk = ordered[start:start + block]
+                chunk = chunk[selected[chunk]]
+                found.append(chunk)
+                count += len(chunk)
+                if count >= wanted:
+                    break
+            page = np.concatenate(found)[offset:wanted]
+        else:
+            rank = self.rank[sort] if sort else self.id_rank
+            keys = rank[candidates]
+            ordered = candidates[np.argsort(-keys if descending else keys)]
+            page = ordered[offset:offset + limit]
+
+        return [self.funds[i] for i in page], total
@@ -0,0 +1,44 @@
+import hashlib
+import os
+import time
+
+from fastapi import Request, Response
+
+# Fund routes enrich responses with live market data that is not covered by the
+# fund data version, so ETags roll over at least this often (seconds)
+ETAG_REFRESH_INTERVAL = int(os.getenv("ETAG_REFRESH_INTERVAL", "3600"))
+
+# How long clients may reuse a response before revalidating it (seconds)
+FUND_CACHE_MAX_AGE = int(os.getenv("FUND_CACHE_MAX_AGE", "0"))
+
+CACHE_CONTROL = f"public, max-age={FUND_CACHE_MAX_AGE}, must-revalidate"
+
+def compute_etag(request: Request, version: str) -> str:
+    """Build a weak ETag for a request from the data version it is served from"""
+    window = int(time.time() // ETAG_REFRESH_INTERVAL) if ETAG_REFRESH_INTERVAL > 0 else 0
+    key = f"{version}|{window}|{request.url.path}|{request.url.query}"
+    # Weak, since live enrichment such as performancePercent can change the bytes within one version
+    return 'W/"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+def _opaque_tag(tag: str) -> str:
+    """Strip the weak prefix from an entity tag"""
+    return tag[2:] if tag.startswith("W/") else tag
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    return _opaque_tag(etag) in [_opaque_tag(tag.strip()) for tag in header.split(",")]
+
+def not_modified(etag: str) -> Response:
+    """Build an empty 304 response carrying the cache headers"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+def set_cache_headers(response: Response, etag: str):
+    """Attach the ETag and Cache-Control headers to a response"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -1,12 +1,22 @@
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 from .routes import router
-from .database import get_db, setup_db
+from .responses import FAST_JSON_RESPONSES, FastJSONResponse, TimedJSONResponse, CompressionMiddleware
+from .metrics import MetricsMiddleware, register_stats, render_metrics
+from .profiling import PROFILING_ENABLED, ProfilingMiddleware
+from .database import get_db, get_cache_stats, get_pool_stats, setup_db
 from sqlalchemy.orm import Session
 
 # Initialize FastAPI app
-app = FastAPI(title="Investment Recommendation API")
+app = FastAPI(
+    title="Investment Recommendation API",
+    default_response_class=FastJSONResponse if FAST_JSON_RESPONSES else TimedJSONResponse
+)
+
+# Compress large responses when fast responses are enabled
+if FAST_JSON_RESPONSES:
+    app.add_middleware(CompressionMiddleware)
 
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
@@ -15,16 +25,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count", "X-Profile-Id"],
 )
 
+# Profile requests on demand; off unless PROFILING_ENABLED is set
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Record per-route latency; added last so it wraps every other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Include router
 app.include_router(router)
 
+# Export pool, cache and job queue stats alongside the latency histograms
+register_stats("db_pool", get_pool_stats)
+register_stats("cache", get_cache_stats)
+
 # Add DB connection check endpoint
 @app.get("/api/db-status")
 def check_db_connection(db: Session = Depends(get_db)):
     return {"status": "connected" if db is not None else "fallback"}
 
+# Add connection pool metrics endpoint
+@app.get("/api/db-pool")
+def get_db_pool_stats():
+    return get_pool_stats()
+
+# Add cache statistics endpoint
+@app.get("/api/cache-stats")
+def get_cache_stats_api():
+    return get_cache_stats()
+
+# Add Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 # If running this file directly
 if __name__ == "__main__":
     import uvicorn
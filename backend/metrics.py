@@ -0,0 +1,98 @@
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+
+# Dedicated registry so /metrics only exposes this app's series
+REGISTRY = CollectorRegistry()
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+STAGE_LATENCY = Histogram(
+    "pipeline_stage_duration_seconds", "Latency of recommendation and forecasting pipeline stages",
+    ["stage"], buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+STAGE_ERRORS = Counter(
+    "pipeline_stage_errors_total", "Pipeline stages that raised an exception",
+    ["stage"], registry=REGISTRY
+)
+
+@contextmanager
+def timed_stage(stage):
+    """Record the duration of a pipeline stage, counting it as an error if it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
+
+class StatsCollector:
+    """Exports the numeric values of stats dicts, such as pool and cache stats, at scrape time"""
+
+    # Stats that only ever increase are exported as counters
+    COUNTER_KEYS = {
+        "checkouts", "timeouts", "hits", "misses", "expirations", "evictions",
+        "invalidations", "submitted", "deduplicated", "rejected", "builds",
+    }
+
+    def __init__(self, prefix, get_stats):
+        self.prefix = prefix
+        self.get_stats = get_stats
+
+    def collect(self):
+        families = {}
+        for name, stats in self.get_stats().items():
+            for key, value in stats.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                metric = f"{self.prefix}_{key}"
+                if metric not in families:
+                    if key in self.COUNTER_KEYS:
+                        families[metric] = CounterMetricFamily(metric, f"{self.prefix} {key}", labels=["name"])
+                    else:
+                        families[metric] = GaugeMetricFamily(metric, f"{self.prefix} {key}", labels=["name"])
+                families[metric].add_metric([name], value)
+        return list(families.values())
+
+def register_stats(prefix, get_stats):
+    """Expose a callable returning {name: {stat: value}} on /metrics"""
+    REGISTRY.register(StatsCollector(prefix, get_stats))
+
+def render_metrics():
+    """Get the Prometheus text exposition and its content type"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+class MetricsMiddleware:
+    """Records request latency per method, route template and status code"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Label by route template rather than raw path to bound cardinality
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_LATENCY.labels(scope["method"], route, str(status_code)).observe(time.perf_counter() - start)
@@ -3,5 +3,7 @@
 from .risk_profiler import RiskProfiler
 from .fund_matcher import FundMatcher
 from .forecasting import FundForecaster
+from .projection import GoalProjector
+from .portfolio import PortfolioAllocator, ReturnCovariance
 
-__all__ = ['RiskProfiler', 'FundMatcher', 'FundForecaster']
+__all__ = ['RiskProfiler', 'FundMatcher', 'FundForecaster', 'GoalProjector', 'PortfolioAllocator', 'ReturnCovariance']
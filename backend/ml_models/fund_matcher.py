@@ -18,6 +18,7 @@ class FundMatcher:
             'Low': 1,
             'Low-Medium': 2,
             'Medium': 3,
+            'Medium-High': 3.5,
             'High': 4, 
             'Very High': 5
         }
@@ -37,8 +38,25 @@ class FundMatcher:
         self.model = NearestNeighbors(n_neighbors=min(5, len(self.funds_data)), algorithm='auto')
         self.model.fit(self.scaled_features)
         
-    def match_funds(self, user_profile, risk_category, top_n=3):
-        """Match funds based on user profile and risk category"""
+    @staticmethod
+    def canonical_contribution(monthly_contribution):
+        """
+        Round a monthly contribution to two significant figures.
+
+        Matching is continuous in the contribution, so rounding it lets nearby
+        profiles share cached results; None means the matcher's default applies.
+        """
+        try:
+            value = float(monthly_contribution)
+        except (ValueError, TypeError):
+            return None
+        if value <= 0:
+            return value
+        return float(f"{value:.2g}")
+
+    @staticmethod
+    def _targets(user_profile, risk_category):
+        """Get the query point for a profile, with its fee and investment limits"""
         # Map risk categories to numeric scores
         risk_category_mapping = {
             'Conservative': 1,
@@ -74,35 +92,50 @@ class FundMatcher:
         except (ValueError, TypeError):
             max_investment = 100000  # Default
             
-        # Create a query point
-        query_point = np.array([
+        # Query point, then the limits used to filter the neighbours
+        return [
             expected_performance,  # Expected performance
             risk_score,           # Risk score
             max_fee / 2,          # Target fee (half of max)
-            max_investment / 2    # Target investment (half of max)
-        ]).reshape(1, -1)
-        
-        # Scale the query point
-        scaled_query = self.scaler.transform(query_point)
+            max_investment / 2,   # Target investment (half of max)
+            max_fee,
+            max_investment
+        ]
+
+    def match_fund_indices(self, user_profiles, risk_categories, top_n=3):
+        """
+        Match funds for many profiles with a single nearest-neighbour search.
+
+        Returns one array of row positions in funds_data per profile, in the
+        order match_funds would return those funds. Profiles with the same
+        query point are searched once.
+        """
+        if not len(user_profiles):
+            return []
+        targets = np.array([
+            self._targets(profile, category) for profile, category in zip(user_profiles, risk_categories)
+        ], dtype=float)
+        unique_targets, inverse = np.unique(targets, axis=0, return_inverse=True)
         
-        # Find nearest neighbors
-        distances, indices = self.model.kneighbors(scaled_query)
+        # Scale the query points and find nearest neighbors
+        scaled_query = self.scaler.transform(unique_targets[:, :4])
+        _, indices = self.model.kneighbors(scaled_query)
         
-        # Get matched funds
-        matched_funds = []
-        for idx in indices[0]:
-            fund = self.funds_data.iloc[idx].to_dict()
-            matched_funds.append(fund)
-            
         # Additional filtering
-        filtered_funds = [
-            fund for fund in matched_funds 
-            if fund['fee'] <= max_fee and fund['minimumInvestment'] <= max_investment * 2
-        ]
+        fees = self.funds_data['fee'].to_numpy()
+        minimums = self.funds_data['minimumInvestment'].to_numpy()
+        keep = (fees[indices] <= unique_targets[:, 4:5]) & (minimums[indices] <= unique_targets[:, 5:6] * 2)
         
-        # If filtered list is too small, add back some funds
-        if len(filtered_funds) < top_n and len(matched_funds) >= top_n:
-            filtered_funds = matched_funds[:top_n]
-            
-        # Limit to top_n
-        return filtered_funds[:top_n]
+        matches = []
+        for row, row_keep in zip(indices, keep):
+            filtered = row[row_keep]
+            # If filtered list is too small, add back some funds
+            if len(filtered) < top_n and len(row) >= top_n:
+                filtered = row[:top_n]
+            matches.append(filtered[:top_n])
+        return [matches[i] for i in inverse.reshape(-1)]
+
+    def match_funds(self, user_profile, risk_category, top_n=3):
+        """Match funds based on user profile and risk category"""
+        indices = self.match_fund_indices([user_profile], [risk_category], top_n)[0]
+        return [self.funds_data.iloc[idx].to_dict() for idx in indices]
@@ -0,0 +1,202 @@
+import numpy as np
+
+# Risk aversion used by mean-variance allocation for each risk category
+RISK_AVERSION = {
+    'Conservative': 10.0,
+    'Moderate': 6.0,
+    'Balanced': 4.0,
+    'Growth': 2.5,
+    'Aggressive': 1.5
+}
+
+# Highest annualized portfolio volatility each risk category accepts; None means uncapped
+VOLATILITY_CAPS = {
+    'Conservative': 0.05,
+    'Moderate': 0.08,
+    'Balanced': 0.12,
+    'Growth': 0.18,
+    'Aggressive': None
+}
+
+class ReturnCovariance:
+    def __init__(self, fund_ids, returns, dense_limit=2000):
+        """
+        Monthly return moments for a whole fund universe.
+
+        returns is a (months, funds) array of monthly percentage returns
+        with NaN where a fund's return for a month is unknown. Covariances
+        are computed pairwise over the months both funds share. Universes of
+        up to dense_limit funds keep the full matrix; larger ones keep only
+        the centred returns and compute each requested submatrix from them.
+        """
+        self.fund_ids = list(fund_ids)
+        self.index = {fund_id: i for i, fund_id in enumerate(self.fund_ids)}
+
+        returns = np.asarray(returns, dtype=float) / 100
+        observed = ~np.isnan(returns)
+        counts = observed.sum(axis=0)
+        self.mean = np.where(counts > 0, np.nansum(returns, axis=0) / np.maximum(counts, 1), np.nan)
+        self.observations = counts
+
+        # Zero-filled centred returns make X'X the pairwise co-moment sum
+        self._centred = np.where(observed, returns - self.mean, 0.0)
+        self._observed = observed.astype(float)
+        self.cov = self._covariance(slice(None)) if len(self.fund_ids) <= dense_limit else None
+
+    def __len__(self):
+        return len(self.fund_ids)
+
+    def __contains__(self, fund_id):
+        i = self.index.get(fund_id)
+        return i is not None and self.observations[i] >= 2
+
+    def _covariance(self, idx):
+        """Pairwise covariance of the funds at idx"""
+        centred = self._centred[:, idx]
+        observed = self._observed[:, idx]
+        pairs = observed.T @ observed
+        return (centred.T @ centred) / np.maximum(pairs - 1, 1)
+
+    def moments(self, fund_ids):
+        """Get the monthly mean vector and covariance submatrix for the given funds"""
+        idx = np.array([self.index[fund_id] for fund_id in fund_ids])
+        cov = self.cov[np.ix_(idx, idx)] if self.cov is not None else self._covariance(idx)
+        return self.mean[idx], cov
+
+class PortfolioAllocator:
+    def __init__(self, risk_aversion=None, volatility_caps=None):
+        """Initialize with per-category risk aversion and volatility caps"""
+        self.risk_aversion = risk_aversion or RISK_AVERSION
+        self.volatility_caps = volatility_caps or VOLATILITY_CAPS
+
+    @staticmethod
+    def _regularize(cov):
+        """Make a pairwise covariance matrix positive definite so it can be solved"""
+        cov = (cov + cov.T) / 2
+        eigenvalues, eigenvectors = np.linalg.eigh(cov)
+        floor = max(eigenvalues.max(), 1e-12) * 1e-8
+        return (eigenvectors * np.maximum(eigenvalues, floor)) @ eigenvectors.T
+
+    @staticmethod
+    def _solve(matrix, rhs):
+        """Solve a linear system, falling back to least squares when it is singular"""
+        try:
+            return np.linalg.solve(matrix, rhs)
+        except np.linalg.LinAlgError:
+            return np.linalg.lstsq(matrix, rhs, rcond=None)[0]
+
+    @classmethod
+    def _long_only(cls, mean, cov, risk_aversion, tolerance=1e-12):
+        """
+        Maximize w'mean - risk_aversion / 2 * w'cov w with weights summing to 1 and no shorts.
+
+        A primal active-set method: each step solves the equality-constrained
+        problem over the funds not pinned at zero. A fund is pinned when the
+        step would take its weight negative, and released again when its
+        Lagrange multiplier shows that buying it would improve the objective.
+        """
+        n = len(mean)
+        # A singular covariance would leave the KKT systems without a unique solution
+        hessian = risk_aversion * cls._regularize(cov)
+        weights = np.full(n, 1 / n)
+        free = np.ones(n, dtype=bool)
+        for _ in range(20 * n + 100):
+            idx = np.flatnonzero(free)
+            k = len(idx)
+            # KKT system: hessian_FF w_F + gamma = mean_F, sum(w_F) = 1
+            kkt = np.zeros((k + 1, k + 1))
+            kkt[:k, :k] = hessian[np.ix_(idx, idx)]
+            kkt[:k, k] = 1
+            kkt[k, :k] = 1
+            solution = cls._solve(kkt, np.append(mean[idx], 1))
+            target, gamma = solution[:k], solution[k]
+
+            if target.min() >= -tolerance:
+                weights = np.zeros(n)
+                weights[idx] = np.maximum(target, 0)
+                # Multipliers of the pinned funds; a negative one means the fund should be held
+                multipliers = hessian @ weights - mean + gamma
+                multipliers[free] = 0
+                if multipliers.min() >= -tolerance * max(1.0, np.abs(mean).max()):
+                    return weights / weights.sum()
+                free[np.argmin(multipliers)] = True
+                continue
+
+            # Move towards the target until the first weight reaches zero, then pin that fund
+            current = weights[idx]
+            falling = target < current
+            ratios = np.full(k, np.inf)
+            ratios[falling] = current[falling] / (current[falling] - target[falling])
+            blocking = np.argmin(ratios)
+            step = min(1.0, ratios[blocking])
+            weights[idx] = current + step * (target - current)
+            weights[idx[blocking]] = 0
+            free[idx[blocking]] = False
+        return np.maximum(weights, 0) / np.maximum(weights, 0).sum()
+
+    @staticmethod
+    def _risk_parity(cov, iterations=500, tolerance=1e-10):
+        """
+        Long-only weights whose contributions to portfolio variance are equal.
+
+        Minimizes y'cov y / 2 - sum(log y) / n by cyclical coordinate descent;
+        each coordinate step is the positive root of a quadratic, so weights
+        stay positive even when funds are negatively correlated.
+        """
+        n = len(cov)
+        budget = 1 / n
+        diagonal = np.diag(cov)
+        y = 1 / np.sqrt(diagonal)
+        for _ in range(iterations):
+            previous = y.copy()
+            for i in range(n):
+                cross = cov[i] @ y - diagonal[i] * y[i]
+                y[i] = (-cross + np.sqrt(cross ** 2 + 4 * diagonal[i] * budget)) / (2 * diagonal[i])
+            if np.abs(y - previous).max() <= tolerance * y.max():
+                break
+        return y / y.sum()
+
+    @staticmethod
+    def _volatility(weights, cov):
+        return float(np.sqrt(max(weights @ cov @ weights, 0)))
+
+    def _apply_cap(self, weights, cov, cap):
+        """Blend towards the minimum-variance portfolio until volatility is within the cap"""
+        if cap is None or self._volatility(weights, cov) <= cap:
+            return weights, False
+        safest = self._long_only(np.zeros(len(weights)), cov, 1.0)
+        if self._volatility(safest, cov) >= cap:
+            return safest, True
+        low, high = 0.0, 1.0
+        for _ in range(50):
+            blend = (low + high) / 2
+            if self._volatility((1 - blend) * weights + blend * safest, cov) > cap:
+                low = blend
+            else:
+                high = blend
+        return (1 - high) * weights + high * safest, True
+
+    def allocate(self, mean, cov, risk_category, method='mean_variance'):
+        """Compute capped portfolio weights from monthly return moments"""
+        # Annualize monthly moments
+        mean = np.asarray(mean, dtype=float) * 12
+        cov = self._regularize(np.asarray(cov, dtype=float) * 12)
+
+        if method == 'risk_parity':
+            weights = self._risk_parity(cov)
+        else:
+            weights = self._long_only(mean, cov, self.risk_aversion.get(risk_category, RISK_AVERSION['Balanced']))
+
+        cap = self.volatility_caps.get(risk_category)
+        weights, capped = self._apply_cap(weights, cov, cap)
+        volatility = self._volatility(weights, cov)
+        contributions = weights * (cov @ weights) / volatility ** 2 if volatility > 0 else weights
+
+        return {
+            'weights': weights,
+            'risk_contributions': contributions,
+            'expected_return': float(weights @ mean),
+            'volatility': volatility,
+            'volatility_cap': cap,
+            'capped': capped
+        }
@@ -0,0 +1,103 @@
+import numpy as np
+
+class GoalProjector:
+    def __init__(self, chunk_elements=2_000_000, percentiles=(5, 25, 50, 75, 95)):
+        """
+        Initialize the Monte Carlo goal projector.
+
+        Paths are simulated in float32 chunks of at most chunk_elements
+        path-months, which bounds the memory used by the intermediate return
+        and growth arrays however many paths are requested.
+        """
+        self.chunk_elements = chunk_elements
+        self.percentiles = percentiles
+
+    @staticmethod
+    def monthly_returns(values):
+        """
+        Convert cumulative percentage-change histories to monthly returns.
+
+        values is a (months, funds) array in the shape of the stored history,
+        e.g. 4.2 for 4.2% above the first month; the result has one row fewer.
+        """
+        growth = 1 + np.asarray(values, dtype=float) / 100
+        # A fund can never be worth less than nothing
+        growth = np.maximum(growth, 1e-6)
+        return growth[1:] / growth[:-1] - 1
+
+    def _portfolio_returns(self, rng, returns, weights, size, months, method):
+        """Draw a (size, months) block of monthly portfolio returns"""
+        if method == "bootstrap":
+            # Resample whole historical months so cross-fund correlation is kept
+            history = (returns @ weights).astype(np.float32)
+            return history[rng.integers(0, len(history), (size, months), dtype=np.int32)]
+
+        mean = returns.mean(axis=0) @ weights
+        cov = np.atleast_2d(np.cov(returns, rowvar=False)) if len(returns) > 1 else np.zeros((len(weights),) * 2)
+        sigma = float(np.sqrt(max(weights @ cov @ weights, 0)))
+        draws = rng.standard_normal((size, months), dtype=np.float32)
+        draws *= sigma
+        draws += mean
+        return np.maximum(draws, -0.99, out=draws)
+
+    def simulate(self, returns, weights, months, monthly_contribution, initial_investment=0.0,
+                 paths=10000, method="bootstrap", seed=None):
+        """
+        Simulate wealth paths for a monthly contribution into a fixed-weight portfolio.
+
+        Contributions are made at the start of each month and the portfolio is
+        rebalanced monthly. Returns the checkpoint months (every year and the
+        final month) and a (paths, checkpoints) array of wealth at each one.
+        """
+        returns = np.atleast_2d(np.asarray(returns, dtype=float))
+        weights = np.asarray(weights, dtype=float)
+        weights = weights / weights.sum()
+        rng = np.random.default_rng(seed)
+
+        checkpoints = np.unique(np.append(np.arange(12, months + 1, 12), months))
+        wealth = np.empty((paths, len(checkpoints)))
+        chunk = max(1, self.chunk_elements // months)
+
+        for start in range(0, paths, chunk):
+            size = min(chunk, paths - start)
+            growth = self._portfolio_returns(rng, returns, weights, size, months, method)
+            growth += 1
+            np.cumprod(growth, axis=1, out=growth)
+            # W_t = G_t * (W_0 + c * sum_{s<t} 1 / G_s), with G_0 = 1, unrolls W_t = (W_{t-1} + c) * (1 + r_t)
+            discounted = np.cumsum(np.reciprocal(growth, out=np.empty_like(growth)), axis=1)
+            contributed = 1 + np.where(checkpoints > 1, discounted[:, np.maximum(checkpoints - 2, 0)], 0)
+            wealth[start:start + size] = (
+                growth[:, checkpoints - 1] * (initial_investment + monthly_contribution * contributed)
+            )
+        return checkpoints, wealth
+
+    def project(self, returns, weights, months, monthly_contribution, initial_investment=0.0,
+                goal_amount=None, paths=10000, method="bootstrap", seed=None):
+        """Summarize simulated wealth as percentile paths and the probability of reaching the goal"""
+        checkpoints, wealth = self.simulate(
+            returns, weights, months, monthly_contribution, initial_investment, paths, method, seed
+        )
+        total_contributed = initial_investment + monthly_contribution * months
+        if goal_amount is None:
+            # Without a target, report the chance of ending up ahead of what was paid in
+            goal_amount = total_contributed
+
+        bands = np.percentile(wealth, self.percentiles, axis=0)
+        final = wealth[:, -1]
+        return {
+            'months': int(months),
+            'paths': int(paths),
+            'method': method,
+            'totalContributed': round(float(total_contributed), 2),
+            'goalAmount': round(float(goal_amount), 2),
+            'probabilityOfReachingGoal': round(float(np.mean(final >= goal_amount)), 4),
+            'expectedFinalWealth': round(float(final.mean()), 2),
+            'finalWealth': {f'p{p}': round(float(v), 2) for p, v in zip(self.percentiles, bands[:, -1])},
+            'percentilePaths': [
+                {
+                    'month': int(month),
+                    **{f'p{p}': round(float(v), 2) for p, v in zip(self.percentiles, bands[:, i])}
+                }
+                for i, month in enumerate(checkpoints)
+            ],
+        }
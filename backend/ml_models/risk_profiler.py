@@ -8,6 +8,9 @@ from sklearn.pipeline import Pipeline
 import pickle
 import os
 
+# Model inputs, in training column order
+FEATURE_COLUMNS = ['age', 'monthly_income', 'investment_goal', 'time_horizon', 'investment_experience']
+
 class RiskProfiler:
     def __init__(self):
         self.model_path = os.path.join(os.path.dirname(__file__), 'risk_model.pkl')
@@ -15,6 +18,12 @@ class RiskProfiler:
         self.model = None
         self.encoders = {}
         self._load_or_create_model()
+        self._age_thresholds = self._split_thresholds('age')
+        # Label lookups that avoid a LabelEncoder.transform call per profile
+        self._codes = {
+            feature: {label: code for code, label in enumerate(encoder.classes_)}
+            for feature, encoder in self.encoders.items()
+        }
     
     def _load_or_create_model(self):
         """Load existing model or create a new one"""
@@ -99,58 +108,86 @@ class RiskProfiler:
         accuracy = self.model.score(X_test, y_test)
         print(f"Model created with accuracy: {accuracy:.2f}")
         
-    def predict_risk_profile(self, data):
-        """Predict risk category based on user data"""
-        # Convert data to DataFrame
-        df = pd.DataFrame([data])
-        
-        # Map monthly_income to income level (1-5)
+    def _split_thresholds(self, feature):
+        """Get the sorted thresholds the decision tree splits a feature on"""
+        feature_names = list(getattr(self.model, 'feature_names_in_', []))
+        if feature not in feature_names:
+            return np.array([])
+        tree = self.model.tree_
+        return np.unique(tree.threshold[tree.feature == feature_names.index(feature)])
+
+    @staticmethod
+    def _income_level(monthly_income):
+        """Map monthly income to the income level (1-5) used in training"""
         try:
-            monthly_income = float(data['monthlyIncome'])
-            if monthly_income < 50000:
-                income_level = 1
-            elif monthly_income < 100000:
-                income_level = 2
-            elif monthly_income < 200000:
-                income_level = 3
-            elif monthly_income < 500000:
-                income_level = 4
-            else:
-                income_level = 5
+            monthly_income = float(monthly_income)
         except (ValueError, TypeError):
-            income_level = 2  # Default to medium if parsing fails
-            
-        df['monthly_income'] = income_level
-        
-        # Rename columns to match training data
-        df = df.rename(columns={
-            'monthlyIncome': 'monthly_income',
-            'investmentGoal': 'investment_goal',
-            'timeHorizon': 'time_horizon',
-            'existingInvestments': 'investment_experience'
-        })
-        
-        # Encode categorical features
-        for feature, encoder in self.encoders.items():
-            if feature in df.columns:
-                try:
-                    df[feature] = encoder.transform(df[feature])
-                except ValueError:
-                    # Handle unseen categories by setting a default value
-                    df[feature] = 0
-        
-        # Ensure we have all the required features
-        required_features = ['age', 'monthly_income', 'investment_goal', 'time_horizon', 'investment_experience']
-        for feature in required_features:
-            if feature not in df.columns:
-                df[feature] = 0  # Default value if feature is missing
-                
-        # Convert age to numeric
+            return 2  # Default to medium if parsing fails
+        if monthly_income < 50000:
+            return 1
+        elif monthly_income < 100000:
+            return 2
+        elif monthly_income < 200000:
+            return 3
+        elif monthly_income < 500000:
+            return 4
+        return 5
+
+    @staticmethod
+    def _parse_age(age):
+        """Convert age to a number, defaulting when parsing fails"""
         try:
-            df['age'] = pd.to_numeric(df['age'])
-        except ValueError:
-            df['age'] = 30  # Default age if parsing fails
-            
-        # Make prediction
-        prediction = self.model.predict(df[required_features])
+            return float(age)
+        except (ValueError, TypeError):
+            return 30  # Default age if parsing fails
+
+    def _encode(self, feature, value):
+        """Encode a categorical value, mapping unseen or missing values to 0"""
+        return self._codes.get(feature, {}).get(value, 0)
+
+    def profile_key(self, data):
+        """
+        Reduce a profile to the inputs that determine its risk category.
+
+        Age is replaced by its band between the tree's age split thresholds,
+        so every profile sharing a key gets the same prediction.
+        """
+        age_band = int(np.searchsorted(self._age_thresholds, self._parse_age(data.get('age')), side='left'))
+        return (
+            age_band,
+            self._income_level(data.get('monthlyIncome')),
+            self._encode('investment_goal', data.get('investmentGoal')),
+            self._encode('time_horizon', data.get('timeHorizon')),
+            self._encode('investment_experience', data.get('existingInvestments')),
+        )
+
+    def _feature_row(self, data):
+        """Get the model inputs for a profile, in training column order"""
+        return [
+            self._parse_age(data.get('age')),
+            self._income_level(data.get('monthlyIncome')),
+            self._encode('investment_goal', data.get('investmentGoal')),
+            self._encode('time_horizon', data.get('timeHorizon')),
+            self._encode('investment_experience', data.get('existingInvestments')),
+        ]
+
+    def predict_risk_profiles(self, data_list):
+        """
+        Predict risk categories for many profiles with a single model call.
+
+        Profiles sharing a profile_key get the same prediction, so only one
+        profile per key is passed to the model.
+        """
+        if not data_list:
+            return np.array([], dtype=object)
+        features = np.array([self._feature_row(data) for data in data_list], dtype=float)
+        keys = np.column_stack([np.searchsorted(self._age_thresholds, features[:, 0], side='left'), features[:, 1:]])
+        _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        predictions = self.model.predict(pd.DataFrame(features[first], columns=FEATURE_COLUMNS))
+        return predictions[inverse.reshape(-1)]
+
+    def predict_risk_profile(self, data):
+        """Predict risk category based on user data"""
+        # Build the row as predict_risk_profiles and profile_key do, so every path sees the same features
+        prediction = self.model.predict(pd.DataFrame([self._feature_row(data)], columns=FEATURE_COLUMNS))
         return prediction[0]  # Return the predicted risk category
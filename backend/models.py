@@ -1,5 +1,5 @@
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any, Union
 
 # ----- User Models -----
@@ -72,3 +72,35 @@ class RecommendationRequest(BaseModel):
 class ForecastRequest(BaseModel):
     fundId: str
     periods: Optional[int] = 6
+    mode: Optional[str] = "sync"  # "job" enqueues uncached forecasts instead of fitting in the request
+
+class ProjectionRequest(BaseModel):
+    profileData: RiskProfileData
+    goalAmount: Optional[float] = None  # Defaults to the total amount contributed
+    initialInvestment: float = Field(0, ge=0)
+    years: Optional[int] = None  # Defaults from profileData.timeHorizon
+    fundIds: Optional[List[str]] = None  # Defaults to the recommended funds
+    weights: Optional[List[float]] = None  # Defaults to equal weights
+    paths: int = Field(10000, ge=1)  # At most MAX_PROJECTION_PATHS
+    method: Optional[str] = "bootstrap"  # "bootstrap" resamples history, "parametric" draws normal returns
+    seed: Optional[int] = None
+
+class PortfolioRequest(BaseModel):
+    profileData: RiskProfileData
+    fundIds: Optional[List[str]] = None  # Defaults to the recommended funds
+    method: Optional[str] = "mean_variance"  # or "risk_parity"
+    amount: Optional[float] = Field(None, ge=0)  # Total to invest, to split into per-fund amounts
+
+class ParameterRange(BaseModel):
+    start: float
+    stop: float  # Inclusive
+    step: float
+
+class WhatIfRequest(BaseModel):
+    profileData: RiskProfileData
+    # Values to try for each parameter, as a list or a range; omitted parameters keep the profile's value
+    ages: Optional[Union[List[float], ParameterRange]] = None
+    monthlyIncomes: Optional[Union[List[float], ParameterRange]] = None
+    monthlyContributions: Optional[Union[List[float], ParameterRange]] = None
+    timeHorizons: Optional[List[str]] = None
+    topN: Optional[int] = 3
@@ -0,0 +1,94 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+# Upper bounds (seconds) of the checkout latency histogram buckets
+CHECKOUT_LATENCY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+class PoolMonitor:
+    """Collects live connection pool statistics for an engine"""
+
+    def __init__(self, name, engine):
+        self.name = name
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._pool = None
+        self.checkouts = 0
+        self.timed_checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.max_wait_time = 0.0
+        self.bucket_counts = [0] * len(CHECKOUT_LATENCY_BUCKETS)
+        # Count checkouts through the public pool event, which engine.dispose() carries over to the new pool
+        event.listen(engine, "checkout", self._on_checkout)
+        self._instrument()
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        """Count one connection handed out by the pool"""
+        with self._lock:
+            self.checkouts += 1
+
+    def _instrument(self):
+        """Time checkouts by wrapping the pool's connection getter, when the pool has one"""
+        pool = self.engine.pool
+        self._pool = pool
+        # No public event fires before a checkout starts waiting, so wait times rely on the
+        # pool's private getter; without it, checkouts are still counted but not timed
+        do_get = getattr(pool, "_do_get", None)
+        if do_get is None:
+            return
+
+        def timed_do_get():
+            start = time.perf_counter()
+            try:
+                return do_get()
+            except PoolTimeoutError:
+                with self._lock:
+                    self.timeouts += 1
+                raise
+            finally:
+                self._observe(time.perf_counter() - start)
+
+        pool._do_get = timed_do_get
+
+    def _observe(self, elapsed):
+        """Record one checkout latency sample"""
+        with self._lock:
+            self.timed_checkouts += 1
+            self.wait_time_total += elapsed
+            self.max_wait_time = max(self.max_wait_time, elapsed)
+            for i, bound in enumerate(CHECKOUT_LATENCY_BUCKETS):
+                if elapsed <= bound:
+                    self.bucket_counts[i] += 1
+                    break
+
+    def snapshot(self):
+        """Get current pool usage and checkout latency statistics"""
+        # engine.dispose() swaps in a fresh pool, so follow it
+        if self.engine.pool is not self._pool:
+            self._instrument()
+
+        pool = self._pool
+        with self._lock:
+            cumulative = 0
+            histogram = {}
+            for bound, count in zip(CHECKOUT_LATENCY_BUCKETS, self.bucket_counts):
+                cumulative += count
+                histogram["+Inf" if bound == float("inf") else str(bound)] = cumulative
+
+            return {
+                "pool_class": type(pool).__name__,
+                "size": pool.size() if hasattr(pool, "size") else None,
+                "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+                "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "timed_checkouts": self.timed_checkouts,
+                "avg_wait_ms": round(self.wait_time_total * 1000 / self.timed_checkouts, 3) if self.timed_checkouts else 0,
+                "max_wait_ms": round(self.max_wait_time * 1000, 3),
+                "checkout_latency_histogram": histogram,
+            }
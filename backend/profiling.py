@@ -0,0 +1,243 @@
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool as _run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Opt in to per-request profiling; nothing is profiled unless this is set
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# Fraction of requests profiled without the header, e.g. 0.01 for 1%
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+
+# Requests carrying this header are always profiled
+PROFILING_HEADER = os.getenv("PROFILING_HEADER", "X-Profile").lower()
+
+# Seconds between stack samples
+PROFILING_INTERVAL = float(os.getenv("PROFILING_INTERVAL", "0.001"))
+
+# Where profiles are written; unset means a profiles directory under DATA_DIR
+PROFILING_DIR = os.getenv("PROFILING_DIR")
+
+# Number of allocation sites kept in each allocation report
+PROFILING_TOP_ALLOCATIONS = int(os.getenv("PROFILING_TOP_ALLOCATIONS", "25"))
+
+# Leaf functions of threads that are idle rather than working
+IDLE_FUNCTIONS = {"wait", "select", "poll", "_wait_for_tstate_lock"}
+
+# Profile of the request being served; threadpool calls inherit it with the rest of the context
+_active_profile = contextvars.ContextVar("active_profile", default=None)
+
+class StackSampler:
+    """
+    Samples the stacks of the threads serving one request on a background thread.
+
+    Sync routes run in Starlette's threadpool, so a sampler sees them where
+    cProfile, which only hooks the calling thread, would not. Only threads in
+    thread_ids are sampled, so concurrent requests on other workers stay out
+    of the profile. Stacks are kept in the collapsed format read by
+    flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval=PROFILING_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.thread_ids = set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.thread_ids):
+                frame = frames.get(thread_id)
+                # Skip idle threads, such as the event loop waiting for I/O
+                if frame is None or frame.f_code.co_name in IDLE_FUNCTIONS:
+                    continue
+                self.stacks[self._collapse(frame)] += 1
+            self.samples += 1
+
+    @staticmethod
+    def _collapse(frame):
+        """Render a frame's stack root-first as 'func (file:line);...'"""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def folded(self):
+        """Get the collapsed stacks, one 'stack count' line each"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+@contextmanager
+def profiled_thread():
+    """Sample the calling thread in the profile of the request it is serving, if that request is profiled"""
+    profile = _active_profile.get()
+    if profile is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    profile.sampler.thread_ids.add(thread_id)
+    try:
+        yield
+    finally:
+        profile.sampler.thread_ids.discard(thread_id)
+
+async def run_in_threadpool(func, *args, **kwargs):
+    """Starlette's run_in_threadpool, sampling the worker thread in the current request's profile"""
+    def run():
+        with profiled_thread():
+            return func(*args, **kwargs)
+    return await _run_in_threadpool(run)
+
+class ProfiledRoute(APIRoute):
+    """API route whose sync endpoints sample their worker thread in the current request's profile"""
+
+    def __init__(self, path, endpoint, **kwargs):
+        if not inspect.iscoroutinefunction(endpoint) and not inspect.isasyncgenfunction(endpoint):
+            endpoint = self._profiled(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _profiled(endpoint):
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            with profiled_thread():
+                return endpoint(*args, **kwargs)
+        return wrapper
+
+class RequestProfile:
+    """Stack samples and allocation growth captured for a single request"""
+
+    def __init__(self):
+        self.sampler = StackSampler()
+        self._started_tracing = False
+        self._before = None
+        self.started_at = None
+        self.elapsed = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self._started_tracing = True
+        self._before = tracemalloc.take_snapshot()
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.sampler.start()
+
+    def stop(self):
+        self.sampler.stop()
+        self.elapsed = time.perf_counter() - self._start
+        after = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+        # Leave out memory held by tracemalloc and the sampler themselves
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        self.allocations = after.filter_traces(filters).compare_to(self._before.filter_traces(filters), "lineno")
+
+    def allocation_report(self, title):
+        """Get the top allocation sites by net growth during the request"""
+        lines = [title, f"elapsed: {self.elapsed * 1000:.1f} ms, stack samples: {self.sampler.samples}", ""]
+        growth = [stat for stat in self.allocations if stat.size_diff > 0]
+        lines.append(f"net allocated: {sum(stat.size_diff for stat in growth) / 1024:.1f} KiB")
+        for stat in growth[:PROFILING_TOP_ALLOCATIONS]:
+            lines.append(str(stat))
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory, name, title):
+        """Write the flamegraph stacks and allocation report, returning their paths"""
+        os.makedirs(directory, exist_ok=True)
+        folded_path = os.path.join(directory, f"{name}.folded")
+        alloc_path = os.path.join(directory, f"{name}.alloc.txt")
+        with open(folded_path, "w") as f:
+            f.write(self.sampler.folded())
+        with open(alloc_path, "w") as f:
+            f.write(self.allocation_report(title))
+        return folded_path, alloc_path
+
+class ProfilingMiddleware:
+    """
+    Profiles requests that send the profiling header or are picked by sampling.
+
+    One request is profiled at a time: stack sampling and tracemalloc are
+    process-wide, so overlapping profiles would attribute work to each other.
+    Other requests that ask for a profile meanwhile are served unprofiled.
+    """
+
+    def __init__(self, app, sample_rate=PROFILING_SAMPLE_RATE, header=PROFILING_HEADER, directory=PROFILING_DIR):
+        if directory is None:
+            # Imported here because the database module runs its threadpool calls through this one
+            from .database import DATA_DIR
+            directory = os.path.join(DATA_DIR, "profiles")
+        self.app = app
+        self.sample_rate = sample_rate
+        self.header = header.encode()
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _wants_profile(self, scope):
+        """Check the profiling header, then fall back to random sampling"""
+        for key, value in scope["headers"]:
+            if key.lower() == self.header and value.decode().lower() not in ("", "0", "false"):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{scope['method'].lower()}-{slug}-{random.getrandbits(24):06x}"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # Let the caller find the profile written for this request
+                message = {**message, "headers": list(message["headers"]) + [(b"x-profile-id", name.encode())]}
+            await send(message)
+
+        try:
+            # Sample the event loop thread, plus any worker thread running this request's sync code
+            profile.sampler.thread_ids.add(threading.get_ident())
+            token = _active_profile.set(profile)
+            profile.start()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profile.stop()
+                _active_profile.reset(token)
+                title = f"{scope['method']} {scope['path']}"
+                try:
+                    folded_path, _ = profile.write(self.directory, name, title)
+                    logger.info(f"Profiled {title} in {profile.elapsed * 1000:.1f} ms, wrote {folded_path}")
+                except OSError as e:
+                    logger.error(f"Could not write profile for {title}: {str(e)}")
+        finally:
+            self._lock.release()
@@ -0,0 +1,77 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+class RecommendationCache:
+    """
+    LRU cache of recommendation lists with a TTL.
+
+    Each entry records the fund data version it was computed from and is
+    treated as a miss once that version moves on.
+    """
+
+    def __init__(self, ttl=300, max_size=1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, version):
+        """Get a copy of the cached recommendations for a key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, entry_version, value = entry
+            if expires_at < time.monotonic() or entry_version != version:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Callers may mutate the funds they get back
+        return copy.deepcopy(value)
+
+    def set(self, key, version, value):
+        """Cache recommendations for a key"""
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        entry = (time.monotonic() + self.ttl, version, copy.deepcopy(value))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every entry, e.g. after the ML models change"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        """Get hit rate and size statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,182 @@
+import gzip
+import os
+from typing import Any
+
+import numpy as np
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+from .metrics import timed_stage
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+# Opt in to orjson serialization and response compression
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _default(obj):
+    """Serialize types orjson does not handle natively"""
+    # NumPy scalars leak out of pandas, e.g. DataFrame.iloc[i].to_dict()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "dict"):
+        return obj.dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes with orjson"""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+class TimedJSONResponse(JSONResponse):
+    """Standard JSON response that records its serialization time"""
+
+    def render(self, content: Any) -> bytes:
+        with timed_stage("serialization"):
+            return super().render(content)
+
+class FastJSONResponse(JSONResponse):
+    """JSON response serialized with orjson, including NumPy arrays and scalars"""
+
+    def render(self, content: Any) -> bytes:
+        with timed_stage("serialization"):
+            return dumps(content)
+
+def fast_response(content: Any, response: Response = None, status_code: int = 200):
+    """
+    Return content as a FastJSONResponse when fast responses are enabled.
+
+    Returning a Response skips FastAPI's jsonable_encoder walk, so headers set on
+    the route's injected response are copied over. When disabled the content is
+    returned unchanged for FastAPI to encode.
+    """
+    if not FAST_JSON_RESPONSES:
+        return content
+
+    fast = FastJSONResponse(content, status_code=status_code)
+    if response is not None:
+        for name, value in response.headers.items():
+            if name.lower() != "content-length":
+                fast.headers[name] = value
+    return fast
+
+def _choose_encoding(accept_encoding: str):
+    """Pick the best supported content encoding from an Accept-Encoding header"""
+    accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a response body with the given content encoding"""
+    if encoding == "br":
+        # Quality 4 keeps latency low while still beating gzip on JSON
+        return brotli.compress(body, quality=4)
+    return gzip.compress(body, compresslevel=6)
+
+def _encoded_headers(raw_headers, **replacements):
+    """
+    Rewrite response headers for a content-encoded representation.
+
+    A strong ETag names the identity bytes, so it is weakened; Vary gains
+    Accept-Encoding; any other given headers are replaced.
+    """
+    headers = []
+    vary = None
+    for key, value in raw_headers:
+        name = key.lower()
+        if name == b"etag" and not value.startswith(b"W/"):
+            value = b"W/" + value
+        if name == b"vary":
+            vary = value
+        elif name.decode() not in replacements:
+            headers.append((key, value))
+    headers += [(key.encode(), value.encode()) for key, value in replacements.items()]
+    headers.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+    return headers
+
+class CompressionMiddleware:
+    """
+    Compress complete responses above COMPRESSION_MIN_SIZE with brotli or gzip.
+
+    Streaming responses are passed through untouched so their chunks are not
+    held back waiting for the whole body. Compressed responses, and 304s sent
+    to clients that accept an encoding, carry a weak ETag and Vary: Accept-Encoding.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict((key.decode().lower(), value.decode()) for key, value in scope["headers"])
+        encoding = _choose_encoding(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                # Hold the start message until the body shows whether to compress
+                start_message = message
+                return
+
+            body = message.get("body", b"")
+            if start_message["status"] == 304:
+                # Revalidations must report the ETag of the representation the client holds
+                passthrough = True
+                await send({**start_message, "headers": _encoded_headers(start_message["headers"])})
+                await send(message)
+                return
+
+            response_headers = dict((k.decode().lower(), v.decode()) for k, v in start_message["headers"])
+            content_type = response_headers.get("content-type", "")
+            compressible = (
+                not message.get("more_body", False)
+                and len(body) >= self.minimum_size
+                and "content-encoding" not in response_headers
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+
+            if not compressible:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            raw_headers = _encoded_headers(
+                start_message["headers"], **{"content-encoding": encoding, "content-length": str(len(compressed))}
+            )
+            await send({**start_message, "headers": raw_headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,16 +1,66 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, List, Optional
+import json
+import re
 from sqlalchemy.orm import Session
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession
+except ImportError:  # Without greenlet the async session dependencies yield None
+    AsyncSession = Any
 from .models import (
     RiskProfileData, UserCreate, UserLogin, TokenResponse,
-    RiskProfileResponse, Fund, RecommendationRequest, ForecastRequest
+    RiskProfileResponse, Fund, RecommendationRequest, ForecastRequest, ProjectionRequest,
+    PortfolioRequest, WhatIfRequest
 )
 from .database import (
-    users_db, get_all_funds, get_fund_by_id, get_fund_recommendations, 
-    get_risk_profile, get_fund_forecast, get_fund_metrics, get_db
+    users_db, get_funds_page_async, get_fund_by_id_async, get_fund_recommendations, 
+    stream_fund_recommendations,
+    fund_exists_async, iter_fund_history, iter_fund_history_async, AsyncReadSessionLocal,
+    get_risk_profile, get_fund_forecast, get_fund_metrics, get_read_db, get_async_read_db,
+    get_fund_data_version, is_forecast_warm, submit_forecast_job, forecast_jobs, get_goal_projection,
+    get_portfolio_allocation, search_funds, get_fund_catalog_version, get_what_if_grid, InvalidRequestError
 )
+from .forecast_jobs import QueueFullError
+from .http_cache import compute_etag, etag_matches, not_modified, set_cache_headers
+from .fund_index import SORT_FIELDS
+from .responses import fast_response, dumps
+from .profiling import ProfiledRoute
 
-# Create router
-router = APIRouter()
+# Create router; sync endpoints register their worker thread with the request's profile
+router = APIRouter(route_class=ProfiledRoute)
+
+# Largest page size accepted by /api/funds
+MAX_FUNDS_PAGE_SIZE = 500
+
+# Months accepted by the history range filters
+MONTH_PATTERN = re.compile(r"\d{4}-(0[1-9]|1[0-2])")
+
+def _json_array(items):
+    """Serialize an iterable of dicts as a streamed JSON array"""
+    yield "["
+    for i, item in enumerate(items):
+        yield ("," if i else "") + json.dumps(item)
+    yield "]"
+
+async def _json_array_async(items):
+    """Serialize an async iterable of dicts as a streamed JSON array"""
+    yield "["
+    first = True
+    async for item in items:
+        yield ("" if first else ",") + json.dumps(item)
+        first = False
+    yield "]"
+
+async def _ndjson(events):
+    """Format events as newline-delimited JSON"""
+    async for event in events:
+        yield dumps(event) + b"\n"
+
+async def _server_sent_events(events):
+    """Format events as server-sent events named after their event type"""
+    async for event in events:
+        yield b"event: " + event["event"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
 
 # ----- API Routes -----
 
@@ -48,9 +98,23 @@ def login_user(user: UserLogin):
     return TokenResponse(access_token=f"mock_token_{user.email}", token_type="bearer")
 
 @router.post("/api/recommendations")
-def get_recommendations(profile_data: RiskProfileData, db: Session = Depends(get_db)):
-    recommendations = get_fund_recommendations(profile_data)
-    return recommendations
+def get_recommendations(profile_data: RiskProfileData, db: Session = Depends(get_read_db)):
+    recommendations = get_fund_recommendations(profile_data, db)
+    return fast_response(recommendations)
+
+@router.post("/api/recommendations/stream")
+async def stream_recommendations(
+    profile_data: RiskProfileData,
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|sse)$", description="Stream format; defaults from the Accept header")
+):
+    events = stream_fund_recommendations(profile_data)
+    use_sse = format == "sse" or (format is None and "text/event-stream" in request.headers.get("accept", ""))
+    if use_sse:
+        return StreamingResponse(
+            _server_sent_events(events), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+        )
+    return StreamingResponse(_ndjson(events), media_type="application/x-ndjson")
 
 @router.post("/api/risk-profile")
 def analyze_risk_profile(profile_data: RiskProfileData):
@@ -81,26 +145,184 @@ def analyze_risk_profile(profile_data: RiskProfileData):
     )
 
 @router.get("/api/funds")
-def get_all_funds_api(db: Session = Depends(get_db)):
-    return get_all_funds()
+async def get_all_funds_api(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fund fields to return, e.g. name,risk,fee"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_FUNDS_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    etag = compute_etag(request, get_fund_data_version())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    requested_fields = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    try:
+        funds, next_cursor = await get_funds_page_async(db, requested_fields, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The body stays a plain list; the cursor for the next page travels in a header
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    set_cache_headers(response, compute_etag(request, get_fund_data_version()))
+    return fast_response(funds, response)
+
+# Declared before /api/funds/{fund_id} so "search" is not taken for a fund ID
+@router.get("/api/funds/search")
+def search_funds_api(
+    request: Request,
+    response: Response,
+    risk: Optional[List[str]] = Query(None, description="Risk levels to include; repeat for several"),
+    asset_class: Optional[List[str]] = Query(None, alias="assetClass", description="Asset classes to include"),
+    company: Optional[List[str]] = Query(None, description="Fund companies to include"),
+    min_fee: Optional[float] = Query(None, alias="minFee"),
+    max_fee: Optional[float] = Query(None, alias="maxFee"),
+    min_investment: Optional[float] = Query(None, alias="minInvestment", description="Lower bound on minimumInvestment"),
+    max_investment: Optional[float] = Query(None, alias="maxInvestment", description="Upper bound on minimumInvestment"),
+    min_performance: Optional[float] = Query(None, alias="minPerformance"),
+    max_performance: Optional[float] = Query(None, alias="maxPerformance"),
+    sort: Optional[str] = Query(None, description="Field to sort by, prefixed with - for descending, e.g. -performancePercent"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_FUNDS_PAGE_SIZE)
+):
+    descending = bool(sort) and sort.startswith("-")
+    sort_field = sort.lstrip("-") if sort else None
+    if sort_field and sort_field not in SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(SORT_FIELDS)}")
+
+    # Search results only depend on fund metadata, so history refreshes keep the ETag valid
+    etag = compute_etag(request, get_fund_catalog_version())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    try:
+        funds, total = search_funds(
+            filters={"risk": risk, "assetClass": asset_class, "company": company},
+            ranges={
+                "fee": (min_fee, max_fee),
+                "minimumInvestment": (min_investment, max_investment),
+                "performancePercent": (min_performance, max_performance),
+            },
+            sort=sort_field, descending=descending, offset=offset, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response.headers["X-Total-Count"] = str(total)
+    set_cache_headers(response, etag)
+    return fast_response(funds, response)
 
 @router.get("/api/funds/{fund_id}")
-def get_fund_details(fund_id: str, db: Session = Depends(get_db)):
-    fund = get_fund_by_id(fund_id)
+async def get_fund_details(
+    fund_id: str, request: Request, response: Response, db: AsyncSession = Depends(get_async_read_db)
+):
+    etag = compute_etag(request, get_fund_data_version())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    fund = await get_fund_by_id_async(fund_id, db)
     if not fund:
         raise HTTPException(status_code=404, detail="Fund not found")
-    return fund
+    # Tag with the version after the market data refresh this request may have stored
+    set_cache_headers(response, compute_etag(request, get_fund_data_version()))
+    return fast_response(fund, response)
+
+@router.get("/api/funds/{fund_id}/history")
+async def get_fund_history(
+    fund_id: str,
+    start: Optional[str] = Query(None, alias="from", description="First month to include (YYYY-MM)"),
+    end: Optional[str] = Query(None, alias="to", description="Last month to include (YYYY-MM)")
+):
+    for name, month in (("from", start), ("to", end)):
+        if month is not None and not MONTH_PATTERN.fullmatch(month):
+            raise HTTPException(status_code=400, detail=f"{name} must be a month in YYYY-MM format")
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+
+    # Stream rows from the range query instead of materializing the whole window
+    if AsyncReadSessionLocal:
+        rows = iter_fund_history_async(fund_id, start, end)
+        if not await rows.__anext__():
+            await rows.aclose()
+            raise HTTPException(status_code=404, detail="Fund not found")
+        body = _json_array_async(rows)
+    else:
+        if not await fund_exists_async(fund_id):
+            raise HTTPException(status_code=404, detail="Fund not found")
+        body = _json_array(iter_fund_history(fund_id, start, end))
+    return StreamingResponse(body, media_type="application/json")
 
 @router.post("/api/forecast")
-def forecast_fund_performance(request: ForecastRequest, db: Session = Depends(get_db)):
-    forecast = get_fund_forecast(request.fundId, request.periods)
+def forecast_fund_performance(request: ForecastRequest, response: Response, db: Session = Depends(get_read_db)):
+    if request.mode not in ("sync", "job"):
+        raise HTTPException(status_code=400, detail="mode must be 'sync' or 'job'")
+
+    # In job mode, cold models are fitted in the background instead of in this request
+    if request.mode == "job" and not is_forecast_warm(request.fundId):
+        try:
+            job = submit_forecast_job(request.fundId, request.periods)
+        except QueueFullError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        if job["status"] == "done":
+            return fast_response({"forecast": job["forecast"], "jobId": job["jobId"]})
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Location"] = f"/api/forecast/jobs/{job['jobId']}"
+        return {"jobId": job["jobId"], "status": job["status"], "statusUrl": f"/api/forecast/jobs/{job['jobId']}"}
+
+    forecast = get_fund_forecast(request.fundId, request.periods, db)
     if not forecast:
         raise HTTPException(status_code=404, detail="Fund not found")
-    return {"forecast": forecast}
+    return fast_response({"forecast": forecast})
+
+@router.get("/api/forecast/jobs/{job_id}")
+async def get_forecast_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for the job to finish before responding")
+):
+    job = await forecast_jobs.wait(job_id, wait)
+    if not job:
+        raise HTTPException(status_code=404, detail="Forecast job not found")
+    return fast_response(job)
+
+@router.post("/api/projection")
+def project_goal(request: ProjectionRequest, db: Session = Depends(get_read_db)):
+    try:
+        projection = get_goal_projection(request, db)
+    except InvalidRequestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if projection is None:
+        raise HTTPException(status_code=404, detail="Fund not found")
+    return fast_response(projection)
+
+@router.post("/api/portfolio")
+def allocate_portfolio(request: PortfolioRequest, db: Session = Depends(get_read_db)):
+    try:
+        allocation = get_portfolio_allocation(request, db)
+    except InvalidRequestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if allocation is None:
+        raise HTTPException(status_code=404, detail="Fund not found")
+    return fast_response(allocation)
+
+@router.post("/api/what-if")
+def what_if_grid(request: WhatIfRequest, db: Session = Depends(get_read_db)):
+    try:
+        grid = get_what_if_grid(request, db)
+    except InvalidRequestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return fast_response(grid)
 
 @router.get("/api/funds/{fund_id}/metrics")
-def get_fund_performance_metrics(fund_id: str, db: Session = Depends(get_db)):
-    metrics = get_fund_metrics(fund_id)
+def get_fund_performance_metrics(
+    fund_id: str, request: Request, response: Response, db: Session = Depends(get_read_db)
+):
+    etag = compute_etag(request, get_fund_data_version())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    metrics = get_fund_metrics(fund_id, db)
     if not metrics:
         raise HTTPException(status_code=404, detail="Fund not found")
-    return metrics
+    set_cache_headers(response, compute_etag(request, get_fund_data_version()))
+    return fast_response(metrics, response)
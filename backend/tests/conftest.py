@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite database and data directory before any test imports it
+TEST_DATA_DIR = tempfile.mkdtemp(prefix="kenyan-funds-tests-")
+os.environ["DATA_DIR"] = TEST_DATA_DIR
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DATA_DIR, 'funds.db')}"
+for name in ("ASYNC_DATABASE_URL", "DATABASE_READ_URL", "ASYNC_DATABASE_READ_URL", "FORECAST_JOB_STORE"):
+    os.environ.pop(name, None)
@@ -0,0 +1,72 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.http_cache import etag_matches, not_modified
+from backend.responses import CompressionMiddleware
+
+ETAG = '"0123456789abcdef"'
+FUNDS = [{"id": f"fund{i}", "name": f"Fund {i}", "fee": 1.5} for i in range(200)]
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/funds")
+    def funds(request: Request):
+        if etag_matches(request, ETAG):
+            return not_modified(ETAG)
+        return JSONResponse(FUNDS, headers={"ETag": ETAG})
+
+    @app.get("/small")
+    def small():
+        return JSONResponse({"id": "fund1"}, headers={"ETag": ETAG})
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((json.dumps(fund) + "\n" for fund in FUNDS), media_type="application/x-ndjson")
+
+    return TestClient(app)
+
+def test_large_responses_are_gzipped_with_a_weak_etag(client):
+    response = client.get("/funds", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == "W/" + ETAG
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(json.dumps(FUNDS))
+    assert response.json() == FUNDS
+
+def test_identity_responses_keep_the_strong_etag(client):
+    response = client.get("/funds", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == ETAG
+    assert "vary" not in response.headers
+    assert response.json() == FUNDS
+
+@pytest.mark.parametrize("tag", [ETAG, "W/" + ETAG])
+def test_revalidating_a_compressed_response_returns_304(client, tag):
+    response = client.get("/funds", headers={"Accept-Encoding": "gzip", "If-None-Match": tag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == "W/" + ETAG
+    assert "Accept-Encoding" in response.headers["vary"]
+
+def test_small_responses_are_not_compressed(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == ETAG
+
+def test_streaming_responses_pass_through(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert [json.loads(line) for line in response.text.splitlines()] == FUNDS
+
+def test_compressed_body_decodes_to_the_original(client):
+    with client.stream("GET", "/funds", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert json.loads(gzip.decompress(raw)) == FUNDS
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.forecast_jobs import ForecastJobQueue, ForecastJobStore, QueueFullError
+
+FORECAST = [{"date": "2026-01", "value": 1.5}]
+
+@pytest.fixture
+def store(tmp_path):
+    return ForecastJobStore(str(tmp_path / "jobs.sqlite3"))
+
+def wait(queue, job_id, timeout=5):
+    return asyncio.run(queue.wait(job_id, timeout))
+
+def test_job_moves_from_queued_through_running_to_done(store):
+    store.create("job1", "fund1", 6, "1.1")
+    assert store.get("job1")["status"] == "queued"
+    assert store.find_active("fund1", 6, "1.1")["jobId"] == "job1"
+    store.update("job1", "running")
+    assert store.get("job1")["status"] == "running"
+    store.update("job1", "done", result=FORECAST, data_version="1.2")
+    job = store.get("job1")
+    assert (job["status"], job["forecast"], job["error"]) == ("done", FORECAST, None)
+    assert job["finishedAt"] is not None
+    assert store.find_active("fund1", 6, "1.1") is None
+    # Finished jobs are tagged with the version their result reflects
+    assert store.find_done("fund1", 6, "1.1") is None
+    assert store.find_done("fund1", 6, "1.2")["jobId"] == "job1"
+
+def test_failed_jobs_keep_their_error(store):
+    store.create("job1", "fund1", 6, "1.1")
+    store.update("job1", "failed", error="Fund not found")
+    job = store.get("job1")
+    assert (job["status"], job["forecast"], job["error"]) == ("failed", None, "Fund not found")
+    assert store.find_done("fund1", 6, "1.1") is None
+
+def test_jobs_of_an_earlier_run_fail_on_restart(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    ForecastJobStore(path).create("job1", "fund1", 6, "1.1")
+    restarted = ForecastJobStore(path)
+    job = restarted.get("job1")
+    assert (job["status"], job["error"]) == ("failed", "Interrupted by restart")
+    assert restarted.find_active("fund1", 6, "1.1") is None
+
+def test_queue_shares_a_running_job_and_stores_its_result(store):
+    release = threading.Event()
+
+    def run_forecast(fund_id, periods):
+        release.wait(5)
+        return FORECAST
+
+    queue = ForecastJobQueue(run_forecast, store, data_version=lambda: "1.2")
+    job_id, reused = queue.submit("fund1", 6, "1.1")
+    assert not reused
+    assert queue.submit("fund1", 6, "1.1") == (job_id, True)
+    release.set()
+    job = wait(queue, job_id)
+    assert (job["status"], job["forecast"]) == ("done", FORECAST)
+    assert store.find_done("fund1", 6, "1.2")["jobId"] == job_id
+    assert queue.stats()["deduplicated"] == 1
+
+def test_full_queue_rejects_new_forecasts(store):
+    release = threading.Event()
+    queue = ForecastJobQueue(lambda fund_id, periods: release.wait(5) and FORECAST, store, max_pending=1)
+    job_id, _ = queue.submit("fund1", 6, "1.1")
+    with pytest.raises(QueueFullError):
+        queue.submit("fund2", 6, "1.1")
+    release.set()
+    assert wait(queue, job_id)["status"] == "done"
+    assert queue.stats()["rejected"] == 1
+
+@pytest.mark.parametrize("run_forecast, error", [
+    (lambda fund_id, periods: None, "Fund not found"),
+    (lambda fund_id, periods: 1 / 0, "division by zero"),
+])
+def test_missing_funds_and_errors_fail_the_job(store, run_forecast, error):
+    queue = ForecastJobQueue(run_forecast, store)
+    job_id, _ = queue.submit("fund1", 6, "1.1")
+    job = wait(queue, job_id)
+    assert (job["status"], job["error"]) == ("failed", error)
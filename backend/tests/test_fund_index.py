@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from backend.benchmarks.bench_search import QUERIES, naive_search
+from backend.benchmarks.fund_universe import generate_funds
+from backend.fund_index import CATEGORICAL_FIELDS, NUMERIC_FIELDS, SORT_FIELDS, FundIndex
+
+@pytest.fixture(scope="module")
+def index():
+    return FundIndex(generate_funds(3000, months=2).funds)
+
+def assert_same_results(index, filters, ranges, sort, descending, offset, limit):
+    page, total = index.search(filters, ranges, sort, descending, offset, limit)
+    expected, expected_total = naive_search(index.funds, filters, ranges, sort, descending, offset, limit)
+    assert total == expected_total
+    assert [fund["id"] for fund in page] == [fund["id"] for fund in expected]
+
+def random_query(rng, index):
+    filters = {}
+    for field in rng.sample(CATEGORICAL_FIELDS, rng.randint(0, 2)):
+        values = sorted({fund[field] for fund in index.funds})
+        filters[field] = rng.sample(values, rng.randint(1, min(3, len(values)))) + rng.choice([[], ["No such value"]])
+    ranges = {}
+    for field in rng.sample(NUMERIC_FIELDS, rng.randint(0, 2)):
+        # Bounds drawn from stored values so inclusive edges and ties are exercised
+        low, high = sorted(rng.choice(index.funds)[field] for _ in range(2))
+        ranges[field] = (rng.choice([low, None]), rng.choice([high, None]))
+    sort = rng.choice((None,) + SORT_FIELDS)
+    return filters, ranges, sort, rng.random() < 0.5, rng.choice([0, 0, 5, 2900]), rng.choice([1, 10, 50, 500])
+
+@pytest.mark.parametrize("name", QUERIES)
+def test_benchmark_queries_match_a_linear_scan(index, name):
+    filters, ranges, sort, descending = QUERIES[name]
+    for offset in (0, 40):
+        assert_same_results(index, filters, ranges, sort, descending, offset, 50)
+
+def test_random_queries_match_a_linear_scan(index):
+    rng = random.Random(3)
+    for _ in range(500):
+        assert_same_results(index, *random_query(rng, index))
+
+def test_unknown_values_and_empty_ranges_match_nothing(index):
+    assert index.search({"risk": ["No such risk"]}) == ([], 0)
+    assert index.search(ranges={"fee": (10.0, 20.0)}) == ([], 0)
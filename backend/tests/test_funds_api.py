@@ -0,0 +1,46 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.benchmarks.fund_universe import generate_funds, load_universe
+from backend.main import app
+
+@pytest.fixture(scope="module")
+def client():
+    load_universe(generate_funds(40, months=6), with_history=False)
+    with TestClient(app) as client:
+        yield client
+
+def all_pages(client, params):
+    """Follow X-Next-Cursor from the first page to the last, returning every page"""
+    pages = []
+    cursor = None
+    while True:
+        response = client.get("/api/funds", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return pages
+
+@pytest.mark.parametrize("limit", [1, 7, 500])
+def test_cursor_pages_cover_every_fund_once_in_order(client, limit):
+    expected = [fund["id"] for fund in client.get("/api/funds", params={"fields": "id"}).json()]
+    pages = all_pages(client, {"fields": "id", "limit": limit})
+    ids = [fund["id"] for page in pages for fund in page]
+    assert ids == sorted(expected)
+    assert all(len(page) == limit for page in pages[:-1])
+    assert 1 <= len(pages[-1]) <= limit
+
+def test_pages_carry_only_the_requested_fields(client):
+    pages = all_pages(client, {"fields": "name,fee", "limit": 10})
+    assert {tuple(fund) for page in pages for fund in page} == {("id", "name", "fee")}
+
+def test_paged_funds_match_the_full_listing(client):
+    full = {fund["id"]: fund for fund in client.get("/api/funds").json()}
+    for page in all_pages(client, {"limit": 9}):
+        for fund in page:
+            assert fund == full[fund["id"]]
+
+@pytest.mark.parametrize("params", [{"cursor": "not a cursor!"}, {"fields": "id,unknown"}])
+def test_bad_cursors_and_fields_are_rejected(client, params):
+    assert client.get("/api/funds", params=params).status_code == 400
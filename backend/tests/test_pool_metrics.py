@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from backend.pool_metrics import PoolMonitor
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    yield engine
+    engine.dispose()
+
+def test_every_checkout_is_counted_and_timed(engine):
+    monitor = PoolMonitor("test", engine)
+    for _ in range(5):
+        with engine.connect():
+            pass
+    stats = monitor.snapshot()
+    assert stats["checkouts"] == 5
+    assert stats["timed_checkouts"] == 5
+    assert stats["checkout_latency_histogram"]["+Inf"] == 5
+    assert stats["checked_out"] == 0
+
+def test_pool_timeouts_are_counted(engine):
+    monitor = PoolMonitor("test", engine)
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+    assert monitor.snapshot()["timeouts"] == 1
+
+def test_hooks_follow_the_pool_after_dispose(engine):
+    monitor = PoolMonitor("test", engine)
+    with engine.connect():
+        pass
+    engine.dispose()
+    monitor.snapshot()
+    with engine.connect():
+        pass
+    stats = monitor.snapshot()
+    assert stats["checkouts"] == 2
+    assert stats["timed_checkouts"] == 2
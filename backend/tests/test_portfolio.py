@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from scipy.optimize import minimize
+
+from backend.ml_models.portfolio import PortfolioAllocator
+
+def objective(weights, mean, cov, risk_aversion):
+    return weights @ mean - risk_aversion / 2 * weights @ cov @ weights
+
+def reference_weights(mean, cov, risk_aversion):
+    """Solve the long-only problem with SLSQP"""
+    n = len(mean)
+    result = minimize(
+        lambda w: -objective(w, mean, cov, risk_aversion),
+        np.full(n, 1 / n),
+        jac=lambda w: -(mean - risk_aversion * cov @ w),
+        bounds=[(0, 1)] * n,
+        constraints=[{"type": "eq", "fun": lambda w: w.sum() - 1}],
+        method="SLSQP",
+        options={"ftol": 1e-14, "maxiter": 1000},
+    )
+    return result.x
+
+def random_problem(rng, singular=False):
+    n = int(rng.integers(2, 9))
+    factors = rng.normal(size=(n, n)) * rng.uniform(0.01, 0.3)
+    cov = factors @ factors.T / n
+    if singular:
+        # Two funds with identical returns
+        cov[:, 0] = cov[:, 1]
+        cov[0, :] = cov[1, :]
+    return rng.normal(0.05, 0.1, n), cov, rng.uniform(0.5, 10)
+
+@pytest.mark.parametrize("singular", [False, True])
+def test_long_only_matches_reference_solver(singular):
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        mean, cov, risk_aversion = random_problem(rng, singular)
+        weights = PortfolioAllocator._long_only(mean, cov, risk_aversion)
+        reference = reference_weights(mean, cov, risk_aversion)
+
+        assert weights.min() >= 0
+        assert weights.sum() == pytest.approx(1)
+        assert objective(weights, mean, cov, risk_aversion) >= objective(reference, mean, cov, risk_aversion) - 1e-9
+
+def test_long_only_re_adds_a_dropped_fund():
+    # Dropping the most negative unconstrained weight alone ends at [0, 0, 1]
+    mean = np.array([-0.15, 0.15, 0.15])
+    cov = np.array([[0.841, -0.145, 0.21], [-0.145, 0.035, -0.018], [0.21, -0.018, 0.094]])
+
+    weights = PortfolioAllocator._long_only(mean, cov, 1.0)
+
+    np.testing.assert_allclose(weights, reference_weights(mean, cov, 1.0), atol=1e-6)
+    assert weights[1] > 0.6
+
+def test_allocate_handles_singular_covariance():
+    cov = np.full((3, 3), 0.002)
+    mean = np.array([0.01, 0.01, 0.008])
+
+    for method in ("mean_variance", "risk_parity"):
+        allocation = PortfolioAllocator().allocate(mean, cov, "Balanced", method)
+        assert allocation["weights"].sum() == pytest.approx(1)
+        assert np.isfinite(allocation["volatility"])
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from backend.ml_models.projection import GoalProjector
+
+RETURNS = np.random.default_rng(0).normal(0.008, 0.04, (36, 3))
+WEIGHTS = [0.5, 0.3, 0.2]
+
+@pytest.mark.parametrize("method", ["bootstrap", "normal"])
+def test_same_seed_gives_the_same_projection(method):
+    first = GoalProjector().project(RETURNS, WEIGHTS, 120, 1000, 5000, paths=2000, method=method, seed=11)
+    second = GoalProjector().project(RETURNS, WEIGHTS, 120, 1000, 5000, paths=2000, method=method, seed=11)
+    assert first == second
+
+@pytest.mark.parametrize("method", ["bootstrap", "normal"])
+def test_chunk_size_does_not_change_the_paths(method):
+    # 121 months makes the chunks hold an odd number of draws
+    _, whole = GoalProjector().simulate(RETURNS, WEIGHTS, 121, 1000, 5000, paths=1001, method=method, seed=5)
+    _, chunked = GoalProjector(chunk_elements=121 * 7).simulate(
+        RETURNS, WEIGHTS, 121, 1000, 5000, paths=1001, method=method, seed=5
+    )
+    np.testing.assert_array_equal(whole, chunked)
+
+def test_different_seeds_give_different_paths():
+    _, first = GoalProjector().simulate(RETURNS, WEIGHTS, 60, 1000, paths=500, seed=1)
+    _, second = GoalProjector().simulate(RETURNS, WEIGHTS, 60, 1000, paths=500, seed=2)
+    assert not np.array_equal(first, second)
+
+def test_constant_returns_match_monthly_compounding():
+    # Every bootstrapped month is the same, so each path is the plain recurrence W_t = (W_{t-1} + c) * (1 + r)
+    returns = np.full((12, 2), 0.01)
+    checkpoints, wealth = GoalProjector().simulate(returns, [0.6, 0.4], 30, 500, 2000, paths=3, seed=0)
+    expected = []
+    value = 2000.0
+    for month in range(1, 31):
+        value = (value + 500) * 1.01
+        if month in checkpoints:
+            expected.append(value)
+    assert checkpoints.tolist() == [12, 24, 30]
+    np.testing.assert_allclose(wealth, np.tile(expected, (3, 1)), rtol=1e-5)
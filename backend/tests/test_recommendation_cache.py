@@ -0,0 +1,61 @@
+from unittest import mock
+
+import pytest
+
+from backend import database
+from backend.benchmarks import bench_ml
+from backend.models import RiskProfileData
+from backend.recommendation_cache import RecommendationCache
+
+PROFILE = RiskProfileData(
+    age="35", monthlyIncome="120000", investmentGoal="wealth", timeHorizon="long",
+    riskTolerance=7, existingInvestments="some", monthlyContribution="15000"
+)
+
+@pytest.fixture(scope="module")
+def market_data():
+    # Serve the stub market series so enrichment stores the same history on every call
+    with mock.patch.object(database.utils, "fetch_real_historical_data", side_effect=lambda *a, **k: bench_ml.history("AGG")):
+        yield
+
+def test_entries_from_an_older_version_miss():
+    cache = RecommendationCache(ttl=60, max_size=10)
+    cache.set("key", "1.1", [{"id": "fund1"}])
+    assert cache.get("key", "1.1") == [{"id": "fund1"}]
+    assert cache.get("key", "1.2") is None
+    # The stale entry is dropped, so the old version misses too
+    assert cache.get("key", "1.1") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_least_recently_used_entries_are_evicted():
+    cache = RecommendationCache(ttl=60, max_size=2)
+    cache.set("a", "1", [1])
+    cache.set("b", "1", [2])
+    cache.get("a", "1")
+    cache.set("c", "1", [3])
+    assert cache.get("b", "1") is None
+    assert cache.get("a", "1") == [1]
+    assert cache.stats()["evictions"] == 1
+
+def test_callers_cannot_mutate_cached_entries():
+    cache = RecommendationCache(ttl=60, max_size=10)
+    funds = [{"id": "fund1"}]
+    cache.set("key", "1", funds)
+    funds[0]["id"] = "changed"
+    cache.get("key", "1")[0]["id"] = "changed"
+    assert cache.get("key", "1") == [{"id": "fund1"}]
+
+def test_recommendations_are_recomputed_after_a_version_bump(market_data):
+    cache = database.recommendation_cache
+    first = database.get_fund_recommendations(PROFILE)
+
+    hits = cache.stats()["hits"]
+    assert database.get_fund_recommendations(PROFILE) == first
+    assert cache.stats()["hits"] == hits + 1
+
+    database.bump_fund_data_version()
+    misses = cache.stats()["misses"]
+    with mock.patch.object(database, "match_recommended_funds", wraps=database.match_recommended_funds) as match:
+        assert [fund["id"] for fund in database.get_fund_recommendations(PROFILE)] == [fund["id"] for fund in first]
+    assert match.call_count == 1
+    assert cache.stats()["misses"] == misses + 1
@@ -0,0 +1,63 @@
+import json
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import database
+from backend.benchmarks import bench_ml
+from backend.main import app
+
+PROFILE = {
+    "age": "58", "monthlyIncome": "400000", "investmentGoal": "retirement", "timeHorizon": "short",
+    "riskTolerance": 2, "existingInvestments": "none", "monthlyContribution": "30000"
+}
+
+@pytest.fixture(scope="module")
+def client():
+    with mock.patch.object(database.utils, "fetch_real_historical_data", side_effect=lambda *a, **k: bench_ml.history("AGG")):
+        with TestClient(app) as client:
+            yield client
+
+def ndjson_events(client):
+    response = client.post("/api/recommendations/stream", json=PROFILE)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def check_stream(events):
+    """Check the event order and return the matched event and each fund's event types"""
+    matched, *fund_events, done = events
+    assert matched["event"] == "matched"
+    assert done == {"event": "done", "fundCount": len(matched["funds"])}
+    stages = {fund["id"]: [] for fund in matched["funds"]}
+    for event in fund_events:
+        stages[event["fundId"]].append(event["event"])
+    assert all(events == ["enrichment", "forecast", "metrics"] for events in stages.values())
+    return matched
+
+def test_first_stream_matches_then_sends_each_stage_per_fund(client):
+    database.recommendation_cache.invalidate()
+    matched = check_stream(ndjson_events(client))
+    assert not matched["cached"]
+    assert matched["funds"]
+
+def test_repeat_stream_replays_the_cached_result(client):
+    first = ndjson_events(client)
+    second = ndjson_events(client)
+    matched = check_stream(second)
+    assert matched["cached"]
+    assert [fund["id"] for fund in matched["funds"]] == [fund["id"] for fund in check_stream(first)["funds"]]
+    metrics = {event["fundId"]: event["metrics"] for event in second if event["event"] == "metrics"}
+    assert metrics == {fund["id"]: fund["metrics"] for fund in matched["funds"]}
+
+def test_server_sent_events_name_each_event(client):
+    response = client.post("/api/recommendations/stream", json=PROFILE, headers={"Accept": "text/event-stream"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        name_line, data_line = block.split("\n")
+        event = json.loads(data_line[len("data: "):])
+        assert name_line == "event: " + event["event"]
+        events.append(event)
+    check_stream(events)
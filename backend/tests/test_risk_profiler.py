@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from backend.ml_models.risk_profiler import RiskProfiler
+
+AGES = ["", None, "abc", "18", "25", "30", "34.5", "45", "61", "79"]
+
+@pytest.fixture(scope="module")
+def profiler():
+    return RiskProfiler()
+
+def random_profiles(n, seed=7):
+    rng = random.Random(seed)
+    profiles = []
+    for _ in range(n):
+        profile = {
+            "monthlyIncome": rng.choice(["", "20000", "75000", "150000", "300000", "900000"]),
+            "investmentGoal": rng.choice(["retirement", "education", "property", "wealth", "emergency", "unknown"]),
+            "timeHorizon": rng.choice(["short", "medium", "long"]),
+            "existingInvestments": rng.choice(["none", "some", "experienced"]),
+        }
+        age = rng.choice(AGES)
+        if age is not None:
+            profile["age"] = age
+        profiles.append(profile)
+    return profiles
+
+def test_single_and_batch_predictions_agree(profiler):
+    profiles = random_profiles(1000)
+    batch = profiler.predict_risk_profiles(profiles)
+    single = [profiler.predict_risk_profile(profile) for profile in profiles]
+    assert list(batch) == single
+
+def test_profiles_sharing_a_key_share_a_category(profiler):
+    categories = {}
+    for profile in random_profiles(1000, seed=11):
+        category = profiler.predict_risk_profile(profile)
+        assert categories.setdefault(profiler.profile_key(profile), category) == category
+
+def test_empty_and_missing_age_default_to_30(profiler):
+    profile = {"monthlyIncome": "75000", "investmentGoal": "wealth", "timeHorizon": "long", "existingInvestments": "some"}
+    expected = profiler.predict_risk_profile({**profile, "age": "30"})
+    assert profiler.predict_risk_profile({**profile, "age": ""}) == expected
+    assert profiler.predict_risk_profile(profile) == expected
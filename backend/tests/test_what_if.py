@@ -0,0 +1,58 @@
+import itertools
+
+import pytest
+
+from backend import database
+from backend.ml_models import FundMatcher
+from backend.models import ParameterRange, WhatIfRequest
+
+PROFILE = {
+    "age": "35", "monthlyIncome": "120000", "investmentGoal": "wealth", "timeHorizon": "long",
+    "riskTolerance": 7, "existingInvestments": "some", "monthlyContribution": "15000"
+}
+
+def grid(profile=PROFILE, **axes):
+    return database.get_what_if_grid(WhatIfRequest(profileData=profile, **axes))
+
+def cell(matrix, index):
+    for i in index:
+        matrix = matrix[i]
+    return matrix
+
+def test_every_cell_matches_the_single_profile_path():
+    result = grid(
+        ages=ParameterRange(start=20, stop=70, step=10), monthlyIncomes=[30000, 150000, 600000],
+        monthlyContributions=[2000, 25000], timeHorizons=["short", "long"]
+    )
+    axes = result["axes"]
+    assert result["shape"] == [6, 3, 2, 2]
+    matcher = database.get_fund_matcher()
+    for index in itertools.product(*(range(len(values)) for values in axes.values())):
+        profile = {**PROFILE, **{field: axes[field][i] for field, i in zip(axes, index)}}
+        profile["monthlyContribution"] = FundMatcher.canonical_contribution(profile["monthlyContribution"])
+        category = database.risk_profiler.predict_risk_profile(profile)
+        funds = [fund["id"] for fund in matcher.match_funds(profile, category)]
+        assert result["riskCategories"][cell(result["categoryMatrix"], index)] == category
+        assert [result["fundIds"][i] for i in cell(result["fundMatrix"], index) if i >= 0] == funds[:3]
+
+def test_axes_have_one_type_each():
+    axes = grid(ages=[25, 40])["axes"]
+    assert axes == {"age": [25.0, 40.0], "monthlyIncome": [120000.0], "monthlyContribution": [15000.0], "timeHorizon": ["long"]}
+    assert all(isinstance(value, float) for field in ("age", "monthlyIncome", "monthlyContribution") for value in axes[field])
+
+def test_unparseable_profile_values_are_reported_as_null():
+    result = grid({**PROFILE, "age": ""}, monthlyIncomes=[40000, 400000])
+    assert result["axes"]["age"] == [None]
+    # The profile is still evaluated as the single-profile path sees it
+    assert result["riskCategories"][cell(result["categoryMatrix"], (0, 1, 0, 0))] == \
+        database.risk_profiler.predict_risk_profile({**PROFILE, "age": "", "monthlyIncome": 400000.0})
+
+@pytest.mark.parametrize("axes", [
+    {"ages": ParameterRange(start=5, stop=1, step=1)},
+    {"ages": []},
+    {"topN": 0},
+    {"ages": ParameterRange(start=0, stop=1e6, step=1)},
+])
+def test_invalid_grids_are_rejected(axes):
+    with pytest.raises(database.InvalidRequestError):
+        grid(**axes)
@@ -11,6 +11,10 @@ logger = logging.getLogger(__name__)
 # Alpha Vantage API key (should be moved to environment variable in production)
 ALPHA_VANTAGE_API_KEY = os.getenv('ALPHA_VANTAGE_API_KEY', 'demo')
 
+# Point at a local stub, e.g. the benchmark market data server, to run offline
+ALPHA_VANTAGE_URL = os.getenv('ALPHA_VANTAGE_URL', 'https://www.alphavantage.co/query')
+ALPHA_VANTAGE_TIMEOUT = float(os.getenv('ALPHA_VANTAGE_TIMEOUT', '10'))
+
 # Mapping of Kenyan fund names to proxy symbols for Alpha Vantage API
 KENYAN_FUND_SYMBOLS = {
     "Money Market Fund": "BIL",  # Treasury Bills ETF
@@ -27,14 +31,14 @@ KENYAN_FUND_SYMBOLS = {
 def fetch_real_historical_data(symbol, months=12):
     """Fetch real historical market data for a given symbol using Alpha Vantage API"""
     try:
-        url = "https://www.alphavantage.co/query"
+        url = ALPHA_VANTAGE_URL
         params = {
             'function': 'TIME_SERIES_MONTHLY',
             'symbol': symbol,
             'apikey': ALPHA_VANTAGE_API_KEY,
         }
         
-        response = requests.get(url, params=params)
+        response = requests.get(url, params=params, timeout=ALPHA_VANTAGE_TIMEOUT)
         data = response.json()
         
         # Check if API returned an error